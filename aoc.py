@@ -1,23 +1,33 @@
 import importlib
+import os
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Annotated
 
 import typer
-from dotenv import load_dotenv
-from pyinstrument import Profiler
 from rich import print
-from typing_extensions import Annotated
 
+from scripts.backends import Backend
+from scripts.profiling import ProfileFormat, ProfilerType
 from scripts.utils import (
-    AnswerResult,
+    STDIN_PATH,
     DataType,
+    chain_phase_hooks,
     create_empty_file,
     get_input,
-    submit_answer,
 )
 
-load_dotenv()
+if TYPE_CHECKING:
+    from scripts.memory import MemoryTracker
+
+# Heavy dependencies (profiler, HTTP client, dotenv, process pools, caches,
+# etc.) are only imported by the code paths needing them, in order to keep
+# startup fast. Only the enums of the options are needed to define commands.
+
 app = typer.Typer()
 
+BENCHMARKS_PATH = Path(__file__).parent / ".benchmarks"
+
 
 @app.command()
 def run(
@@ -28,23 +38,199 @@ def run(
     data_type: Annotated[
         DataType,
         typer.Option(
-            help="Data type: 'input' for user data, or 'example' for example data",
+            help=(
+                "Data type: 'input' for user data, 'example' for example data, "
+                "or 'generated' for generated data"
+            ),
         ),
     ] = DataType.INPUT,
     benchmark: Annotated[
         bool, typer.Option(help="Activate benchmark mode is specified")
     ] = False,
+    profiler: Annotated[
+        ProfilerType, typer.Option(help="Profiler used in benchmark mode")
+    ] = ProfilerType.PYINSTRUMENT,
+    profile_format: Annotated[
+        ProfileFormat,
+        typer.Option(
+            help="Format of the profiles: 'text' to print them, or a file format"
+        ),
+    ] = ProfileFormat.TEXT,
     submit: Annotated[
         bool, typer.Option(help="Submit the solution on AoC (AOC_SESSION_ID needed)")
     ] = False,
+    parse_cache: Annotated[
+        bool, typer.Option(help="Cache the parsed input on disk for next runs")
+    ] = False,
+    cache: Annotated[
+        bool, typer.Option(help="Use results cached by a previous identical run")
+    ] = True,
+    refresh: Annotated[
+        bool, typer.Option(help="Compute results again and refresh the cache")
+    ] = False,
+    parallel_parts: Annotated[
+        bool, typer.Option(help="Solve both parts concurrently in separate workers")
+    ] = False,
+    parallel_shards: Annotated[
+        bool | None,
+        typer.Option(
+            "--parallel-shards/--no-parallel-shards",
+            help="Map shards of lines on a process pool, by default for big inputs",
+            show_default=False,
+        ),
+    ] = None,
+    backend: Annotated[
+        Backend | None,
+        typer.Option(
+            help="Backend solving the puzzle if supported, chosen on input size otherwise",
+            show_default=False,
+        ),
+    ] = None,
+    startup_report: Annotated[
+        bool, typer.Option(help="Break down the interpreter and imports time")
+    ] = False,
+    latency_budget: Annotated[
+        float, typer.Option(min=0, help="Run latency budget for the report (ms)")
+    ] = 500,
+    instrument: Annotated[
+        bool, typer.Option(help="Record statistics of the hot functions")
+    ] = False,
+    instrument_output: Annotated[
+        Path | None,
+        typer.Option(help="JSON file in which hot functions statistics are written"),
+    ] = None,
+    memory: Annotated[
+        bool, typer.Option(help="Report memory allocated by each phase")
+    ] = False,
+    input_file: Annotated[
+        Path | None,
+        typer.Option(
+            "--input",
+            help="File to solve instead of the data type one ('-' for stdin)",
+            show_default=False,
+        ),
+    ] = None,
+    inputs: Annotated[
+        Path | None,
+        typer.Option(
+            file_okay=False,
+            exists=True,
+            help="Folder of input files to solve in batch, as JSON lines",
+            show_default=False,
+        ),
+    ] = None,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            min=1,
+            help="Number of worker processes for --inputs, number of cores by default",
+            show_default=False,
+        ),
+    ] = None,
 ):
     """
     Run the solution for a given day.
 
-    If --benchmark is used, pyinstrument will profile the process.
+    If --benchmark is used, loading, parsing and each part are profiled
+    separately, with pyinstrument or cProfile (--profiler). Profiles are printed,
+    or written in .profiles/dayNN with --profile-format (html and speedscope
+    for pyinstrument, pstats for both).
 
     If --submit is used, solution will be submitted on AoC website using your AOC_SESSION_ID.
+
+    If --parse-cache is used, parsed input is cached on disk and reused as long
+    as neither the input nor the solver code changes.
+
+    Results are cached, and returned right away as long as neither the input nor
+    the solver code changes. Use --no-cache or --refresh to compute them again.
+
+    If --parallel-parts is used, both parts are solved concurrently in separate
+    worker processes, unless the solver shares mutable state between them.
+
+    Map-reduce solvers map shards of lines on a process pool for big inputs.
+    Use --parallel-shards to always do so (for stdin for instance), or
+    --no-parallel-shards to never do so.
+
+    If --backend is used, the puzzle is solved with the given backend, if the
+    day supports it: python (default), array (compact arrays) or numpy (needs
+    NumPy, the previous backends being used otherwise). The fastest available
+    backend is used for big inputs by default.
+
+    If --startup-report is used, the time spent starting the interpreter and
+    importing modules is reported, and compared with the latency budget.
+
+    If --instrument is used, calls, cumulative time and cache statistics of the
+    functions marked as hot are displayed after solving (and exported as JSON
+    with --instrument-output). Parts and shards of lines are then solved in the
+    current process, as they are with --memory and --benchmark.
+
+    If --memory is used, memory allocated while loading, parsing and solving
+    each part is traced with tracemalloc, and reported along with the top
+    allocation sites and the peak RSS of the process.
+
+    If --input is used, the given file is solved instead of the data type one.
+    Solvers streaming their input can also read it from stdin with '-', in
+    which case neither results nor parsed input are cached. They fold their
+    input in a single pass, timed and profiled as the parsing stage.
+
+    If --inputs is used, every file of the folder is solved on a process pool,
+    and results are written as JSON lines as soon as they're available, along
+    with the time taken by each file. Throughput is displayed at the end. Only
+    --backend and --workers can be used along with it.
     """
+    if inputs:
+        # Files are solved in workers, without caches, profiling nor reports
+        incompatible_options = {
+            "--input": input_file is not None,
+            "--data-type": data_type != DataType.INPUT,
+            "--benchmark": benchmark,
+            "--submit": submit,
+            "--parse-cache": parse_cache,
+            "--parallel-parts": parallel_parts,
+            "--parallel-shards": parallel_shards is not None,
+            "--startup-report": startup_report,
+            "--instrument": instrument or instrument_output is not None,
+            "--memory": memory,
+        }
+        if used_options := [
+            name for name, used in incompatible_options.items() if used
+        ]:
+            print(f"[red]--inputs can't be used with {', '.join(used_options)}.[/red]")
+            raise typer.Exit(1)
+
+        run_batch(day=day, inputs_path=inputs, workers=workers, backend=backend)
+        return
+
+    start = time.perf_counter()
+
+    # Instrumentation must be enabled before the module of the day is imported
+    if instrument:
+        from scripts import instrumentation
+
+        instrumentation.enable()
+        parallel_parts = parallel_shards = False
+
+    # Memory is traced in the current process, from the loading of the input
+    memory_tracker = None
+    if memory:
+        from scripts.memory import MemoryTracker
+
+        memory_tracker = MemoryTracker()
+        parallel_parts = parallel_shards = False
+
+    # Phases are profiled in the current process as well
+    phase_profiler = None
+    if benchmark:
+        from scripts.profiling import PhaseProfiler
+
+        try:
+            phase_profiler = PhaseProfiler(
+                day=day, profiler_type=profiler, profile_format=profile_format
+            )
+        except ValueError as error:
+            print(f"[red]{error}[/red]")
+            raise typer.Exit(1)
+        parallel_parts = parallel_shards = False
 
     # Load module of the day
     try:
@@ -58,29 +244,81 @@ def run(
         puzzle_solver = day_module.PuzzleSolver(
             day=day,
             data_type=data_type,
+            parse_cache=parse_cache,
+            phase_hook=chain_phase_hooks(memory_tracker, phase_profiler),
+            data_file=input_file,
+            parallel_shards=parallel_shards,
+            backend=backend,
         )
     except FileNotFoundError:
+        file_name = input_file or f"{data_type.value}.txt"
+        print(f"[red]File [bold]{file_name}[/bold] not found for day {day}.[/red]")
+        raise typer.Exit(1)
+    except ValueError as error:
+        print(f"[red]{error}.[/red]")
+        raise typer.Exit(1)
+
+    if backend and puzzle_solver.backend != backend:
         print(
-            f"[red]File [bold]{data_type.value}.txt[/bold] not found for day {day}.[/red]"
+            f"[yellow]Backend {backend} isn't installed, "
+            f"{puzzle_solver.backend} is used instead[/yellow]"
         )
-        raise typer.Exit(1)
+
+    # Standard input can't be hashed before being read
+    if input_file == STDIN_PATH:
+        cache = False
+        if parse_cache:
+            print("[yellow]Parsed input can't be cached for stdin, ignored[/yellow]")
 
     print(f"Running puzzle solver for day {day}...")
     if is_example := data_type == DataType.EXAMPLE:
         print("Computing example data...")
 
-    # Execution with benchmark if specified
+    if cache:
+        from scripts.cache import AnswerCache
+
+        answer_cache = AnswerCache()
+        cache_key = {
+            "day": day,
+            "data_type": data_type.value,
+            "input_hash": puzzle_solver.input_hash,
+            "source_hash": puzzle_solver.source_hash,
+        }
+
+    # Execution with benchmark if specified, results are never cached then
     if benchmark is True:
         print("Benchmark mode activated !")
-        profiler = Profiler()
-        profiler.start()
-        results = puzzle_solver.solve()
-        profiler.stop()
+        results = puzzle_solver.solve(parallel_parts=parallel_parts)
         print(f"[green]Results : [bold]{results}[/bold][/green]")
-        profiler.print()
+        for profile_file in phase_profiler.profile_files:
+            print(f"Profile written in [bold]{profile_file}[/bold]")
+    elif (
+        cache
+        and not refresh
+        and not instrument
+        and not memory
+        and (results := answer_cache.get(**cache_key))
+    ):
+        print(f"[green]Results (cached) : [bold]{results}[/bold][/green]")
     else:
-        results = puzzle_solver.solve()
+        results = puzzle_solver.solve(parallel_parts=parallel_parts)
         print(f"[green]Results : [bold]{results}[/bold][/green]")
+        if cache:
+            answer_cache.set(**cache_key, results=results)
+
+    if instrument:
+        print_instrumentation_report(day=day, output=instrument_output)
+
+    if memory_tracker:
+        memory_tracker.stop()
+        print_memory_report(memory_tracker)
+
+    if startup_report:
+        print_startup_report(
+            day=day,
+            run_time=time.perf_counter() - start,
+            latency_budget=latency_budget / 1000,
+        )
 
     # Stop here if we're not planning to submit anything
     if not submit:
@@ -92,26 +330,666 @@ def run(
         raise typer.Exit(1)
 
     # Send the solution for the tasks having an answer
-    for task, result in enumerate(results, 1):
-        if result is None:
-            continue
+    submit_results({day: results})
+
+
+def run_batch(
+    day: int, inputs_path: Path, workers: int | None, backend: Backend | None
+) -> None:
+    """Results are written on stdout as JSON lines, the rest on stderr"""
+    import json
 
-        match submit_answer(day=day, task=task, answer=result):
-            case AnswerResult.ALREADY_SOLVED:
-                print(f"[red]Task {task} has already been solved ![/red]")
+    from scripts.runner import get_existing_days, get_input_files, run_inputs
+
+    if day not in get_existing_days():
+        print(f"[red]No puzzle solver for [bold]day {day}[/bold] yet.[/red]")
+        raise typer.Exit(1)
+
+    if not (input_files := get_input_files(inputs_path)):
+        print(f"[red]No input file found in [bold]{inputs_path}[/bold].[/red]")
+        raise typer.Exit(1)
+
+    # Unsupported backend is reported once, instead of failing every file
+    backends = importlib.import_module(f"days.day{day:02d}.main").PuzzleSolver.backends
+    if backend and backend not in backends:
+        print(
+            f"[red]Backend {backend} isn't supported for day {day}, use one of "
+            f"{', '.join(backends)}.[/red]"
+        )
+        raise typer.Exit(1)
+
+    start = time.perf_counter()
+    nb_errors = 0
+    for input_run in run_inputs(
+        day, input_files=input_files, workers=workers, backend=backend
+    ):
+        nb_errors += input_run.error is not None
+        typer.echo(
+            json.dumps(
+                {
+                    "file": str(input_run.input_file),
+                    "results": input_run.results,
+                    "duration": input_run.duration,
+                    "error": input_run.error,
+                }
+            )
+        )
+    wall_time = time.perf_counter() - start
+
+    typer.echo(
+        f"Solved {len(input_files) - nb_errors}/{len(input_files)} inputs in "
+        f"{wall_time:.3f}s ({len(input_files) / wall_time:.1f} inputs/s)",
+        err=True,
+    )
+    if nb_errors:
+        raise typer.Exit(1)
+
+
+def print_memory_report(memory_tracker: "MemoryTracker") -> None:
+    from rich.table import Table
+
+    from scripts.memory import format_size, get_peak_rss
+
+    table = Table(title="Memory report")
+    table.add_column("Phase")
+    table.add_column("Net", justify="right")
+    table.add_column("Peak", justify="right")
+    for phase_memory in memory_tracker.phases:
+        table.add_row(
+            phase_memory.phase,
+            format_size(phase_memory.net),
+            format_size(phase_memory.peak),
+        )
+    print(table)
+
+    table = Table(title="Top allocation sites")
+    table.add_column("Phase")
+    table.add_column("Location")
+    table.add_column("Size", justify="right")
+    table.add_column("Blocks", justify="right")
+    for phase_memory in memory_tracker.phases:
+        for site in phase_memory.top_sites:
+            table.add_row(
+                phase_memory.phase,
+                site.location.removeprefix(f"{Path(__file__).parent}/"),
+                format_size(site.size),
+                str(site.count),
+            )
+    print(table)
+
+    if (peak_rss := get_peak_rss()) is not None:
+        print(f"Peak RSS : [bold]{format_size(peak_rss)}[/bold]")
+
+
+def print_instrumentation_report(day: int, output: Path | None) -> None:
+    from rich.table import Table
+
+    from scripts.instrumentation import export_stats, get_stats
+
+    functions_stats = get_stats()
+    table = Table(title="Hot functions")
+    table.add_column("Function", overflow="fold")
+    table.add_column("Calls", justify="right")
+    table.add_column("Total time", justify="right")
+    table.add_column("Per call", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit ratio", justify="right")
+    table.add_column("Cache size", justify="right")
+    for stats in functions_stats:
+        table.add_row(
+            stats.name.removeprefix(f"days.day{day:02d}.main."),
+            str(stats.calls),
+            f"{stats.total_time * 1000:.1f}ms",
+            f"{stats.total_time / stats.calls * 1_000_000:.2f}µs"
+            if stats.calls
+            else "-",
+            str(stats.hits) if stats.hits is not None else "-",
+            str(stats.misses) if stats.misses is not None else "-",
+            f"{stats.hit_ratio:.1%}" if stats.hit_ratio is not None else "-",
+            str(stats.cache_size) if stats.cache_size is not None else "-",
+        )
+    print(table)
+
+    if output:
+        export_stats(output)
+        print(f"Hot functions statistics written in [bold]{output}[/bold]")
+
+
+def print_startup_report(day: int, run_time: float, latency_budget: float) -> None:
+    from rich.table import Table
+
+    from scripts.startup import measure_startup
+
+    print("Measuring startup time...")
+    report = measure_startup(["aoc", f"days.day{day:02d}.main"])
+
+    table = Table(title="Startup report")
+    table.add_column("Step")
+    table.add_column("Time", justify="right")
+    table.add_row("Interpreter startup", f"{report.interpreter * 1000:.1f}ms")
+    table.add_row("Imports", f"{report.application_imports_time * 1000:.1f}ms")
+    for module, duration in report.application_imports.items():
+        table.add_row(f"  {module}", f"{duration * 1000:.1f}ms")
+        for nested_module, nested_duration in sorted(
+            report.nested_imports[module].items(),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:5]:
+            table.add_row(f"    {nested_module}", f"{nested_duration * 1000:.1f}ms")
+    table.add_row("Run", f"{run_time * 1000:.1f}ms")
+
+    latency = report.interpreter + report.application_imports_time + run_time
+    color = "green" if latency <= latency_budget else "red"
+    table.add_row(
+        "[bold]Total latency[/bold]",
+        f"[bold {color}]{latency * 1000:.1f}ms[/bold {color}]",
+    )
+    print(table)
+
+    if latency > latency_budget:
+        print(
+            f"[red]Latency is over the budget of {latency_budget * 1000:.0f}ms ![/red]"
+        )
+
+
+def submit_results(days_results: dict[int, tuple[int, int]]) -> None:
+    """Submit the answers of several days at once, in a single queue"""
+    import asyncio
+
+    from scripts.submissions import AnswerResult, Submission, submit_answers
+
+    load_environment()
+    if not (session_id := os.getenv("AOC_SESSION_ID")):
+        print("[red]No session ID found, answers can't be submitted to AoC[/red]")
+        raise typer.Exit(1)
+
+    submissions = [
+        Submission(day=day, task=task, answer=result)
+        for day, results in days_results.items()
+        for task, result in enumerate(results, 1)
+        if result is not None
+    ]
+    submission_results = asyncio.run(submit_answers(submissions, session_id=session_id))
+
+    for submission_result in submission_results:
+        day, task = submission_result.submission.day, submission_result.submission.task
+        known = " (already submitted)" if submission_result.known else ""
+        match submission_result.result:
+            case AnswerResult.WRONG_LEVEL:
+                print(
+                    f"[red]Day {day} task {task} has already been solved, "
+                    "or the previous task hasn't been solved yet ![/red]"
+                )
             case AnswerResult.RIGHT_ANSWER:
-                print(f"[green]Your answer for task {task} is right ![/green]")
+                print(
+                    f"[green]Your answer for day {day} task {task} is right !{known}[/green]"
+                )
             case AnswerResult.WRONG_ANSWER:
-                print(f"[red]Your answer for task {task} is wrong ![/red]")
+                print(
+                    f"[red]Your answer for day {day} task {task} is wrong !{known}[/red]"
+                )
+            case AnswerResult.TOO_RECENT:
+                print(
+                    f"[red]Answer for day {day} task {task} submitted too recently, "
+                    "try again later[/red]"
+                )
             case _:
                 continue
 
 
+@app.command()
+def run_all(
+    days: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Days or ranges of days to run (ex: 1-5 8), every day by default",
+            show_default=False,
+        ),
+    ] = None,
+    data_type: Annotated[
+        DataType,
+        typer.Option(
+            help=(
+                "Data type: 'input' for user data, 'example' for example data, "
+                "or 'generated' for generated data"
+            ),
+        ),
+    ] = DataType.INPUT,
+    workers: Annotated[
+        int | None,
+        typer.Option(
+            min=1,
+            help="Number of worker processes, number of cores by default",
+            show_default=False,
+        ),
+    ] = None,
+    submit: Annotated[
+        bool, typer.Option(help="Submit the solutions on AoC (AOC_SESSION_ID needed)")
+    ] = False,
+):
+    """
+    Run the solutions for several days in parallel, on a process pool.
+
+    Results and wall time are displayed for each day, along with the total
+    wall time and the sum of the days wall times. As days are timed while
+    running concurrently, this sum is only an estimate of a sequential run.
+
+    If --submit is used, solutions of every day will be submitted on AoC website
+    using your AOC_SESSION_ID.
+    """
+    from scripts.runner import parse_days, run_days
+
+    try:
+        days_to_run = parse_days(days)
+    except ValueError as error:
+        print(f"[red]{error}[/red]")
+        raise typer.Exit(1)
+
+    if not days_to_run:
+        print("[red]No puzzle solver found for the given days.[/red]")
+        raise typer.Exit(1)
+
+    print(f"Running puzzle solvers for {len(days_to_run)} days...")
+
+    from rich.table import Table
+
+    start = time.perf_counter()
+    day_runs = []
+    for day_run in run_days(days_to_run, data_type=data_type, workers=workers):
+        status = "[green]done[/green]" if not day_run.error else "[red]failed[/red]"
+        print(f"Day {day_run.day} {status} in {day_run.duration:.3f}s")
+        day_runs.append(day_run)
+    wall_time = time.perf_counter() - start
+
+    table = Table(title=f"Results ({data_type.value})")
+    table.add_column("Day", justify="right")
+    table.add_column("Results")
+    table.add_column("Wall time", justify="right")
+    for day_run in sorted(day_runs, key=lambda day_run: day_run.day):
+        table.add_row(
+            str(day_run.day),
+            str(day_run.results)
+            if not day_run.error
+            else f"[red]{day_run.error}[/red]",
+            f"{day_run.duration:.3f}s",
+        )
+    print(table)
+
+    # Days wall times are measured while sharing the cores, so their sum
+    # doesn't measure a sequential run, no speedup is derived from it
+    days_time = sum(day_run.duration for day_run in day_runs)
+    print(
+        f"Total wall time : [bold]{wall_time:.3f}s[/bold] "
+        f"(sum of days, run concurrently : {days_time:.3f}s)"
+    )
+
+    if submit:
+        if data_type != DataType.INPUT:
+            print("[red]You can only send answers for input data[/red]")
+            raise typer.Exit(1)
+
+        submit_results(
+            {
+                day_run.day: day_run.results
+                for day_run in day_runs
+                if day_run.results is not None
+            }
+        )
+
+    if any(day_run.error for day_run in day_runs):
+        raise typer.Exit(1)
+
+
+@app.command()
+def bench(
+    days: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Days or ranges of days to benchmark (ex: 1-5 8), every day by default",
+            show_default=False,
+        ),
+    ] = None,
+    data_type: Annotated[
+        DataType,
+        typer.Option(
+            help=(
+                "Data type: 'input' for user data, 'example' for example data, "
+                "or 'generated' for generated data"
+            ),
+        ),
+    ] = DataType.INPUT,
+    warmups: Annotated[
+        int, typer.Option(min=0, help="Number of runs before timing")
+    ] = 1,
+    repeats: Annotated[int, typer.Option(min=1, help="Number of timed runs")] = 5,
+    output: Annotated[
+        Path, typer.Option(help="JSON file in which results are written")
+    ] = BENCHMARKS_PATH / "latest.json",
+    baseline: Annotated[
+        Path, typer.Option(help="JSON file of the baseline to compare with")
+    ] = BENCHMARKS_PATH / "baseline.json",
+    save_baseline: Annotated[
+        bool, typer.Option(help="Save the results as the new baseline")
+    ] = False,
+    threshold: Annotated[
+        float,
+        typer.Option(min=0, help="Tolerated slowdown before failing (0.2 for 20%)"),
+    ] = 0.2,
+    noise_floor: Annotated[
+        float,
+        typer.Option(min=0, help="Slowdowns ignored as noise, whatever the ratio (ms)"),
+    ] = 1.0,
+    history: Annotated[
+        bool, typer.Option(help="Record the results in the benchmark history")
+    ] = True,
+):
+    """
+    Benchmark the solutions of several days.
+
+    Loading, parsing, first part and second part are timed separately over
+    several runs, and results are compared with the baseline. Fails if any minimum timing is
+    slower than the baseline one by more than the given threshold, and by more
+    than the noise floor.
+
+    Results are recorded in the benchmark history along with the current
+    commit, see the bench-history command.
+    """
+    from rich.table import Table
+
+    from scripts.benchmark import (
+        benchmark_day,
+        find_regressions,
+        load_benchmark,
+        save_benchmark,
+    )
+    from scripts.runner import DAYS_PATH, parse_days
+
+    try:
+        days_to_bench = parse_days(days)
+    except ValueError as error:
+        print(f"[red]{error}[/red]")
+        raise typer.Exit(1)
+
+    if history:
+        from scripts.history import BenchmarkHistory, get_input_hash
+
+        benchmark_history = BenchmarkHistory()
+
+    benchmark = {
+        "data_type": data_type.value,
+        "warmups": warmups,
+        "repeats": repeats,
+        "days": {},
+    }
+
+    table = Table(title=f"Benchmark ({data_type.value}, {repeats} runs)")
+    table.add_column("Day", justify="right")
+    table.add_column("Phase")
+    for stat in ("min", "median", "p95", "stddev"):
+        table.add_column(stat, justify="right")
+
+    for day in days_to_bench:
+        print(f"Benchmarking puzzle solver for day {day}...")
+        try:
+            phases = benchmark_day(
+                day=day, data_type=data_type, warmups=warmups, repeats=repeats
+            )
+        except FileNotFoundError:
+            print(
+                f"[red]File [bold]{data_type.value}.txt[/bold] not found for day {day}.[/red]"
+            )
+            raise typer.Exit(1)
+
+        benchmark["days"][str(day)] = phases
+        if history:
+            benchmark_history.record(
+                day=day,
+                data_type=data_type.value,
+                input_hash=get_input_hash(
+                    DAYS_PATH / f"day{day:02d}" / f"{data_type.value}.txt"
+                ),
+                phases=phases,
+            )
+        for phase, stats in phases.items():
+            table.add_row(
+                str(day),
+                phase,
+                *(f"{stats[stat] * 1000:.3f}ms" for stat in stats),
+            )
+
+    print(table)
+
+    save_benchmark(output, benchmark)
+    print(f"Results written in [bold]{output}[/bold]")
+
+    if save_baseline:
+        save_benchmark(baseline, benchmark)
+        print(f"[green]Results saved as baseline in [bold]{baseline}[/bold][/green]")
+        return
+
+    if not baseline.exists():
+        print("[yellow]No baseline to compare with, use --save-baseline[/yellow]")
+        return
+
+    baseline_benchmark = load_benchmark(baseline)
+    if baseline_benchmark["data_type"] != data_type.value:
+        print("[yellow]Baseline has been computed on another data type[/yellow]")
+        return
+
+    if not (
+        regressions := find_regressions(
+            benchmark, baseline_benchmark, threshold, noise_floor=noise_floor / 1000
+        )
+    ):
+        print("[green]No regression compared with the baseline ![/green]")
+        return
+
+    for regression in regressions:
+        print(
+            f"[red]Regression on [bold]day {regression.day} ({regression.phase})"
+            f"[/bold] : {regression.baseline * 1000:.3f}ms -> "
+            f"{regression.current * 1000:.3f}ms (x{regression.ratio:.2f})[/red]"
+        )
+    raise typer.Exit(1)
+
+
+@app.command()
+def bench_history(
+    days: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Days or ranges of days to display (ex: 1-5 8), every day by default",
+            show_default=False,
+        ),
+    ] = None,
+    data_type: Annotated[
+        DataType,
+        typer.Option(
+            help=(
+                "Data type: 'input' for user data, 'example' for example data, "
+                "or 'generated' for generated data"
+            ),
+        ),
+    ] = DataType.INPUT,
+    phase: Annotated[
+        str, typer.Option(help="Phase to follow: total, load, parse, part 1, part 2")
+    ] = "total",
+    threshold: Annotated[
+        float,
+        typer.Option(min=0, help="Tolerated slowdown between commits (0.2 for 20%)"),
+    ] = 0.2,
+    limit: Annotated[
+        int, typer.Option(min=1, help="Number of latest commits displayed per day")
+    ] = 10,
+):
+    """
+    Display the benchmark history of several days, commit after commit.
+
+    Each commit median timing is compared with the previous one measured with
+    the same Python version and input, and commits slower by more than the
+    threshold are flagged as regressions.
+    """
+    from rich.table import Table
+
+    from scripts.history import BenchmarkHistory
+    from scripts.runner import parse_days
+
+    benchmark_history = BenchmarkHistory()
+    try:
+        days_to_display = (
+            parse_days(days) if days else benchmark_history.get_days(data_type.value)
+        )
+    except ValueError as error:
+        print(f"[red]{error}[/red]")
+        raise typer.Exit(1)
+
+    if not days_to_display:
+        print("[yellow]No benchmark history yet, use the bench command[/yellow]")
+        return
+
+    for day in days_to_display:
+        trend = benchmark_history.get_trend(
+            day=day, data_type=data_type.value, phase=phase
+        )
+        if not trend:
+            continue
+
+        table = Table(title=f"Day {day} ({phase}, {data_type.value})")
+        table.add_column("Commit")
+        table.add_column("Python")
+        table.add_column("Input")
+        table.add_column("Runs", justify="right")
+        table.add_column("Median", justify="right")
+        table.add_column("Change", justify="right")
+        for point in trend[-limit:]:
+            if point.ratio is None:
+                change = "-"
+            elif point.ratio > 1 + threshold:
+                change = f"[bold red]x{point.ratio:.2f} (regression)[/bold red]"
+            elif point.ratio < 1 / (1 + threshold):
+                change = f"[green]x{point.ratio:.2f}[/green]"
+            else:
+                change = f"x{point.ratio:.2f}"
+            table.add_row(
+                point.commit,
+                point.python_version,
+                point.input_hash[:8],
+                str(point.nb_runs),
+                f"{point.median * 1000:.3f}ms",
+                change,
+            )
+        print(table)
+
+
+@app.command()
+def generate(
+    day: Annotated[
+        int,
+        typer.Argument(
+            min=1, max=26, help="Day of input to generate (ex: 1 for day01)"
+        ),
+    ],
+    scale: Annotated[
+        int, typer.Option(min=1, help="Size of the input, 1 being a real input size")
+    ] = 1,
+    seed: Annotated[int, typer.Option(help="Seed of the random generator")] = 0,
+):
+    """
+    Generate a synthetic input for a given day.
+
+    The input is written in the generated.txt file of the day, which can then
+    be used with --data-type generated.
+    """
+    import random
+
+    try:
+        day_module = importlib.import_module(f"days.day{day:02d}.main")
+    except ModuleNotFoundError:
+        print(f"[red]No puzzle solver for [bold]day {day}[/bold] yet.[/red]")
+        raise typer.Exit(1)
+
+    if (generate_input := day_module.PuzzleSolver.generate_input) is None:
+        print(f"[red]No input generator for [bold]day {day}[/bold] yet.[/red]")
+        raise typer.Exit(1)
+
+    lines = generate_input(scale=scale, rng=random.Random(seed))
+
+    generated_file = (
+        Path(__file__).parent
+        / "days"
+        / f"day{day:02d}"
+        / f"{DataType.GENERATED.value}.txt"
+    )
+    print(f"Generating input for day {day} (scale {scale}, seed {seed})...")
+    with generated_file.open("w") as file:
+        file.writelines(f"{line}\n" for line in lines)
+
+    print(f"[green]File [bold]{generated_file}[/bold] generated ![/green]")
+
+
+@app.command()
+def fetch(
+    days: Annotated[
+        list[str] | None,
+        typer.Argument(
+            help="Days or ranges of days to fetch (ex: 1-5 8), every day by default",
+            show_default=False,
+        ),
+    ] = None,
+    concurrency: Annotated[
+        int, typer.Option(min=1, help="Maximum number of concurrent downloads")
+    ] = 4,
+):
+    """
+    Download the inputs of several days concurrently (AOC_SESSION_ID needed).
+
+    Inputs already downloaded are only downloaded again if they changed.
+    """
+    import asyncio
+
+    from scripts.client import FetchStatus, fetch_inputs
+    from scripts.runner import parse_days
+
+    load_environment()
+    if not (session_id := os.getenv("AOC_SESSION_ID")):
+        print("[red]No session ID found, inputs can't be retrieved from AoC[/red]")
+        raise typer.Exit(1)
+
+    try:
+        days_to_fetch = parse_days(days)
+    except ValueError as error:
+        print(f"[red]{error}[/red]")
+        raise typer.Exit(1)
+
+    print(f"Retrieving inputs of {len(days_to_fetch)} days from AoC...")
+    fetch_results = asyncio.run(
+        fetch_inputs(days_to_fetch, session_id=session_id, concurrency=concurrency)
+    )
+
+    for fetch_result in fetch_results:
+        match fetch_result.status:
+            case FetchStatus.DOWNLOADED:
+                print(f"[green]Input of day {fetch_result.day} downloaded ![/green]")
+            case FetchStatus.UNCHANGED:
+                print(f"Input of day {fetch_result.day} unchanged")
+            case FetchStatus.FAILED:
+                print(
+                    f"[red]Error when retrieving input of day {fetch_result.day} : "
+                    f"{fetch_result.error}[/red]"
+                )
+
+    if any(result.status == FetchStatus.FAILED for result in fetch_results):
+        raise typer.Exit(1)
+
+
 @app.command()
 def create_next_day():
     """
     Create the folder structure and files for the next day
     """
+    load_environment()
+
     days_path = Path(__file__).parent / "days"
     days_path.mkdir(exist_ok=True)  # Make sure "days" folder exists
 
@@ -164,5 +1042,12 @@ def create_next_day():
         create_empty_file(file_path=input_file_path)
 
 
+def load_environment() -> None:
+    """Load AoC settings from the dotenv file, only needed when reaching AoC"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
 if __name__ == "__main__":
     app()
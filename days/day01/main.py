@@ -1,41 +1,248 @@
+import random
+from array import array
 from collections import Counter
-from typing import Iterable
+from typing import TYPE_CHECKING, Generator, Iterator
 
-from scripts.utils import AbstractPuzzleSolver
+from scripts.backends import Backend
+from scripts.utils import StreamingPuzzleSolver
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class PuzzleSolver(StreamingPuzzleSolver):
+    # Lines are folded one at a time into count tables by default, lists are
+    # stored in compact arrays or NumPy arrays for big inputs
+    backends = (Backend.PYTHON, Backend.ARRAY, Backend.NUMPY)
+
+    # Bytes of the input parsed at once into the compact arrays
+    chunk_size: int = 1 << 20
+
+    # Range of location IDs from which they're too sparse to be counted in
+    # tables (4 bytes per location ID in the range, for each list)
+    max_count_table_size: int = 1 << 24
 
-class PuzzleSolver(AbstractPuzzleSolver):
     ###########################
     # DAY 01 - Common Part
     ###########################
 
-    def _process_input_lists(self) -> tuple[Iterable[int], Iterable[int]]:
-        return zip(*(map(int, line.split("   ")) for line in self.lines))
+    # Count tables of both lists, or NumPy arrays of the lists themselves
+    parsed_input: "tuple[Counter[int], Counter[int]] | CountTables | tuple[np.ndarray, np.ndarray]"
+
+    def parse(
+        self,
+    ) -> "tuple[Counter[int], Counter[int]] | CountTables | tuple[np.ndarray, np.ndarray]":
+        """Count tables are built once from the compact arrays, and used by
+        both parts. Location IDs too sparse for them are counted in dicts.
+        """
+        match self.backend:
+            case Backend.NUMPY:
+                return self._parse_numpy_arrays()
+            case Backend.ARRAY:
+                first_array, second_array = self._parse_compact_arrays()
+                if (
+                    CountTables.get_size(first_array, second_array)
+                    <= self.max_count_table_size
+                ):
+                    return CountTables(first_array, second_array)
+                return Counter(first_array), Counter(second_array)
+            case _:
+                return super().parse()
+
+    def _parse_compact_arrays(self) -> tuple[array, array]:
+        """Parse the location IDs into arrays of C integers (4 bytes each instead
+        of about 36 for a Python integer in a list). Input is parsed by chunks
+        ending on a line break, so that it's never entirely split at once.
+        """
+        first_array, second_array = array("i"), array("i")
+        start, data_length = 0, len(self.data)
+        while start < data_length:
+            end = self.data.find(b"\n", min(start + self.chunk_size, data_length - 1))
+            if end == -1:
+                end = data_length
+            location_ids = array("i", map(int, self.data[start:end].split()))
+            first_array.extend(location_ids[::2])
+            second_array.extend(location_ids[1::2])
+            start = end + 1
+        return first_array, second_array
+
+    def _parse_numpy_arrays(self) -> tuple["np.ndarray", "np.ndarray"]:
+        """Parse every location ID of the raw input at once, in a single array
+        whose columns are the two lists. NumPy only parses bytes objects, so the
+        memory-mapped input is copied once.
+        """
+        import numpy as np
+
+        location_ids = np.fromstring(self.data[:], dtype=np.int64, sep=" ")
+        return location_ids[::2], location_ids[1::2]
+
+    def _initial_state(self) -> tuple[Counter[int], Counter[int]]:
+        """Occurrences of each location ID in both lists"""
+        return Counter(), Counter()
+
+    def _fold_line(
+        self, state: tuple[Counter[int], Counter[int]], line: str
+    ) -> tuple[Counter[int], Counter[int]]:
+        """Only the number of occurrences of each location ID is kept in both
+        lists, which is enough for both parts.
+        """
+        if line:
+            first_location_id, second_location_id = line.split()
+            state[0][int(first_location_id)] += 1
+            state[1][int(second_location_id)] += 1
+        return state
 
     ###########################
     # DAY 01 - First Part
     ###########################
 
     def _solve_first_part(self) -> int:
-        first_list, second_list = self._process_input_lists()
+        if self.backend == Backend.NUMPY:
+            return self._get_total_distance_with_numpy(*self.parsed_input)
+        if isinstance(self.parsed_input, CountTables):
+            return self._get_total_distance(*self.parsed_input.iter_sorted_runs())
+        return self._get_total_distance(*map(self._iter_sorted_runs, self.parsed_input))
 
-        first_list = sorted(first_list)
-        second_list = sorted(second_list)
+    def _get_total_distance(
+        self,
+        first_runs: Iterator[tuple[int, int]],
+        second_runs: Iterator[tuple[int, int]],
+    ) -> int:
+        """Both sorted lists are walked run by run, a run being all occurrences
+        of a location ID, so that they never have to be rebuilt.
+        """
+        total_distance = 0
+        first_location_id, first_nb = next(first_runs, (0, 0))
+        second_location_id, second_nb = next(second_runs, (0, 0))
 
-        return sum(
-            abs(second_location_id - first_location_id)
-            for first_location_id, second_location_id in zip(first_list, second_list)
-        )
+        while first_nb and second_nb:
+            nb = min(first_nb, second_nb)
+            total_distance += nb * abs(second_location_id - first_location_id)
+            first_nb, second_nb = first_nb - nb, second_nb - nb
+            if not first_nb:
+                first_location_id, first_nb = next(first_runs, (0, 0))
+            if not second_nb:
+                second_location_id, second_nb = next(second_runs, (0, 0))
+
+        return total_distance
+
+    def _get_total_distance_with_numpy(
+        self, first_array: "np.ndarray", second_array: "np.ndarray"
+    ) -> int:
+        import numpy as np
+
+        return int(np.abs(np.sort(second_array) - np.sort(first_array)).sum())
+
+    @staticmethod
+    def _iter_sorted_runs(counter: Counter[int]) -> Iterator[tuple[int, int]]:
+        """Location IDs in increasing order, along with their occurrences. Only
+        distinct location IDs are sorted, which is cheaper than walking their
+        range for inputs of a real size (about 1000 IDs of 5 digits).
+        """
+        return ((location_id, counter[location_id]) for location_id in sorted(counter))
 
     ###########################
     # DAY 01 - Second Part
     ###########################
 
     def _solve_second_part(self) -> int:
-        first_list, second_list = self._process_input_lists()
-        first_dict, second_dict = Counter(first_list), Counter(second_list)
+        if self.backend == Backend.NUMPY:
+            return self._get_similarity_score_with_numpy(*self.parsed_input)
+        if isinstance(self.parsed_input, CountTables):
+            return self.parsed_input.get_similarity_score()
+        return self._get_similarity_score(*self.parsed_input)
+
+    def _get_similarity_score(
+        self, first_counter: Counter[int], second_counter: Counter[int]
+    ) -> int:
+        return sum(
+            location_id * first_counter_nb * second_counter[location_id]
+            for location_id, first_counter_nb in first_counter.items()
+        )
+
+    def _get_similarity_score_with_numpy(
+        self, first_array: "np.ndarray", second_array: "np.ndarray"
+    ) -> int:
+        """Occurrences of each location ID of the first list are looked up in
+        the sorted distinct location IDs of the second list.
+        """
+        import numpy as np
+
+        location_ids, counts = np.unique(second_array, return_counts=True)
+        if not len(location_ids):
+            return 0
+
+        indexes = np.searchsorted(location_ids, first_array).clip(
+            max=len(location_ids) - 1
+        )
+        is_found = location_ids[indexes] == first_array
+        return int((first_array[is_found] * counts[indexes[is_found]]).sum())
+
+    ###########################
+    # DAY 01 - Input Generation
+    ###########################
 
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Location IDs of the second list are often taken from the first one,
+        so that the similarity score isn't always zero.
+        """
+        nb_lines = 1000 * scale
+        first_list = [rng.randint(10000, 99999) for _ in range(nb_lines)]
+        for first_location_id in first_list:
+            second_location_id = (
+                rng.choice(first_list)
+                if rng.random() < 0.5
+                else rng.randint(10000, 99999)
+            )
+            yield f"{first_location_id}   {second_location_id}"
+
+
+class CountTables:
+    """Occurrences of each location ID in both lists, stored in arrays of C
+    integers indexed by location ID (minus the smallest one). Walking a table
+    gives the location IDs in increasing order, which is a counting sort in
+    linear time of the number of lines and of the range of location IDs.
+    """
+
+    def __init__(self, first_array: array, second_array: array):
+        self.offset = min(first_array + second_array, default=0)
+        size = self.get_size(first_array, second_array)
+        self.first_counts = self._count(first_array, size)
+        self.second_counts = self._count(second_array, size)
+
+    @staticmethod
+    def get_size(first_array: array, second_array: array) -> int:
+        """Range of the location IDs of both lists"""
+        location_ids = first_array + second_array
+        if not location_ids:
+            return 0
+        return max(location_ids) - min(location_ids) + 1
+
+    def iter_sorted_runs(
+        self,
+    ) -> tuple[Iterator[tuple[int, int]], Iterator[tuple[int, int]]]:
+        """Location IDs of both lists in increasing order, along with their
+        occurrences.
+        """
+        return tuple(
+            ((self.offset + index, nb) for index, nb in enumerate(counts) if nb)
+            for counts in (self.first_counts, self.second_counts)
+        )
+
+    def get_similarity_score(self) -> int:
         return sum(
-            location_id * first_dict_nb * second_dict[location_id]
-            for location_id, first_dict_nb in first_dict.items()
+            (self.offset + index) * first_nb * second_nb
+            for index, (first_nb, second_nb) in enumerate(
+                zip(self.first_counts, self.second_counts)
+            )
+            if first_nb and second_nb
         )
+
+    def _count(self, location_ids: array, size: int) -> array:
+        counts, offset = array("I", [0]) * size, self.offset
+        for location_id in location_ids:
+            counts[location_id - offset] += 1
+        return counts
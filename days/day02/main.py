@@ -1,27 +1,89 @@
-from scripts.utils import AbstractPuzzleSolver
+import random
+from typing import TYPE_CHECKING, Generator
 
+from scripts.backends import Backend
+from scripts.instrumentation import hot
+from scripts.utils import MapReducePuzzleSolver
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class PuzzleSolver(MapReducePuzzleSolver):
+    # Reports are checked one at a time by default, in shards mapped in parallel
+    # for big inputs, or all at once with vectorized operations
+    backends = (Backend.PYTHON, Backend.NUMPY)
 
-class PuzzleSolver(AbstractPuzzleSolver):
     ###########################
     # DAY 02 - Common Part
     ###########################
-    def solve(self) -> tuple[int, int]:
-        self.reports: list["Report"] = [Report.from_line(line) for line in self.lines]
-        return super().solve()
+
+    parsed_input: "tuple[int, int] | ReportsBatch"
+
+    def parse(self) -> "tuple[int, int] | ReportsBatch":
+        if self.backend == Backend.NUMPY:
+            return ReportsBatch.from_data(self.data[:])
+        return super().parse()
+
+    def _initial_state(self) -> tuple[int, int]:
+        """Number of stable reports, without and with bad level tolerance"""
+        return 0, 0
+
+    def _map_line(self, line: str) -> tuple[int, int]:
+        if not line:
+            return 0, 0
+
+        # A stable report is also stable when tolerating a bad level
+        report = Report.from_line(line)
+        if report.is_stable:
+            return 1, 1
+
+        return 0, int(report.is_stable_by_tolerating_bad_level)
+
+    def _reduce(
+        self, first: tuple[int, int], second: tuple[int, int]
+    ) -> tuple[int, int]:
+        return first[0] + second[0], first[1] + second[1]
 
     ###########################
     # DAY 02 - First Part
     ###########################
 
     def _solve_first_part(self) -> int:
-        return sum(report.is_stable for report in self.reports)
+        if self.backend == Backend.NUMPY:
+            return int(self.parsed_input.are_stable().sum())
+        return self.parsed_input[0]
 
     ###########################
     # DAY 02 - Second Part
     ###########################
 
     def _solve_second_part(self) -> int:
-        return sum(report.is_stable_by_tolerating_bad_level for report in self.reports)
+        if self.backend == Backend.NUMPY:
+            return int(self.parsed_input.are_stable_by_tolerating_bad_level().sum())
+        return self.parsed_input[1]
+
+    ###########################
+    # DAY 02 - Input Generation
+    ###########################
+
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Stable reports are generated, and some of their levels are then
+        replaced by bad ones, so that every kind of report is represented.
+        """
+        for _ in range(1000 * scale):
+            direction = rng.choice((-1, 1))
+            levels = [rng.randint(10, 90)]
+            for _ in range(rng.randint(4, 7)):
+                levels.append(levels[-1] + direction * rng.randint(1, 3))
+
+            for _ in range(rng.choice((0, 0, 1, 1, 2))):
+                levels[rng.randrange(len(levels))] += rng.randint(-4, 4)
+
+            yield " ".join(map(str, levels))
 
 
 class Report:
@@ -33,6 +95,7 @@ class Report:
         return cls(levels=[int(level) for level in line.split(" ")])
 
     @property
+    @hot
     def is_stable(self) -> bool:
         is_increasing: bool | None = None
 
@@ -54,8 +117,126 @@ class Report:
 
     @property
     def is_stable_by_tolerating_bad_level(self) -> bool:
-        return self.is_stable or any(
-            Report(levels_subset).is_stable
-            for i in range(len(self.levels))
-            if (levels_subset := self.levels[:i] + self.levels[i + 1 :])
+        """For a given direction, one of the levels of the first bad pair must be
+        removed, as they would stay next to each other otherwise. Only these two
+        removals are checked then, in place, so the report is scanned at most
+        three times per direction.
+        """
+        for direction in (1, -1):
+            if (bad_pair := self._find_bad_pair(direction)) is None or any(
+                self._find_bad_pair(direction, skipped_index=index) is None
+                for index in bad_pair
+            ):
+                return True
+
+        return False
+
+    def _find_bad_pair(
+        self, direction: int, skipped_index: int | None = None
+    ) -> tuple[int, int] | None:
+        """Indexes of the first consecutive levels (ignoring the skipped one)
+        not changing by 1 to 3 in the given direction, if any.
+        """
+        previous_index: int | None = None
+        for index, level in enumerate(self.levels):
+            if index == skipped_index:
+                continue
+            if previous_index is not None and not (
+                1 <= direction * (level - self.levels[previous_index]) <= 3
+            ):
+                return previous_index, index
+            previous_index = index
+
+        return None
+
+
+class ReportsBatch:
+    """Every report at once, its levels being stored in a row of a 2D array,
+    padded to the length of the longest report.
+    """
+
+    def __init__(self, levels: "np.ndarray", lengths: "np.ndarray"):
+        import numpy as np
+
+        self.levels = levels
+        self.lengths = lengths
+        self.nb_reports, self.width = levels.shape
+
+        # Differences between consecutive levels, the padding ones being ignored
+        self.differences = np.diff(levels, axis=1)
+        self.is_real_pair = np.arange(self.width - 1) < (lengths - 1)[:, None]
+
+    @classmethod
+    def from_data(cls, data: bytes) -> "ReportsBatch":
+        import numpy as np
+
+        # Levels of each report are counted on the raw buffer, as the starts of
+        # digits runs, grouped by the number of newlines preceding them
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        are_digits = (buffer >= ord("0")) & (buffer <= ord("9"))
+        are_starts = are_digits & ~np.concatenate(([False], are_digits[:-1]))
+        lines_ids = np.cumsum(buffer == ord("\n"), dtype=np.int32)
+        lengths = np.bincount(lines_ids[are_starts])
+        lengths = lengths[lengths > 0]
+
+        width = int(lengths.max()) if len(lengths) else 0
+        levels = np.zeros((len(lengths), width), dtype=np.int64)
+        levels[np.arange(width) < lengths[:, None]] = np.fromstring(
+            data, dtype=np.int64, sep=" "
         )
+        return cls(levels=levels, lengths=lengths)
+
+    def are_stable(self) -> "np.ndarray":
+        return self._are_good_pairs(1).all(axis=1) | self._are_good_pairs(-1).all(
+            axis=1
+        )
+
+    def are_stable_by_tolerating_bad_level(self) -> "np.ndarray":
+        """A report is stable without its level k if the pairs before k-1 and
+        after k+1 are good, along with the pair bridging k-1 and k+1. Every k
+        is checked at once, with cumulative "all good" masks over the pairs.
+        """
+        import numpy as np
+
+        if self.width <= 2:
+            return np.ones(self.nb_reports, dtype=bool)
+
+        is_real_level = np.arange(self.width) < self.lengths[:, None]
+        ones = np.ones((self.nb_reports, 2), dtype=bool)
+        bridges = self.levels[:, 2:] - self.levels[:, :-2]
+
+        are_stable = np.zeros(self.nb_reports, dtype=bool)
+        for direction in (1, -1):
+            good_pairs = self._are_good_pairs(direction)
+
+            # Whether pairs 0 to k-2 are good, and pairs k+1 to the end
+            all_good_from_start = np.logical_and.accumulate(good_pairs, axis=1)
+            all_good_until_end = np.logical_and.accumulate(good_pairs[:, ::-1], axis=1)[
+                :, ::-1
+            ]
+            good_prefixes = np.hstack((ones, all_good_from_start[:, :-1]))
+            good_suffixes = np.hstack((all_good_until_end[:, 1:], ones))
+
+            # Whether levels k-1 and k+1 make a good pair, when both exist
+            bridge_changes = direction * bridges
+            is_last_level = np.arange(1, self.width - 1) >= (self.lengths - 1)[:, None]
+            good_bridges = np.hstack(
+                (
+                    ones[:, :1],
+                    (1 <= bridge_changes) & (bridge_changes <= 3) | is_last_level,
+                    ones[:, :1],
+                )
+            )
+
+            are_stable |= (
+                is_real_level & good_prefixes & good_suffixes & good_bridges
+            ).any(axis=1)
+
+        return are_stable
+
+    def _are_good_pairs(self, direction: int) -> "np.ndarray":
+        """Whether each pair of consecutive levels changes by 1 to 3 in the
+        given direction, pairs of the padding being always good.
+        """
+        changes = direction * self.differences
+        return (1 <= changes) & (changes <= 3) | ~self.is_real_pair
@@ -1,46 +1,128 @@
+import random
 import re
+import sys
+from typing import Generator
 
-from scripts.utils import AbstractPuzzleSolver
+from scripts.utils import STDIN_PATH, StreamingPuzzleSolver
 
 
-class PuzzleSolver(AbstractPuzzleSolver):
-    first_mul_pattern = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
-    second_mul_pattern = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)|don\'t\(\)|do\(\)")
+class PuzzleSolver(StreamingPuzzleSolver):
+    mul_pattern = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|don\'t\(\)|do\(\)")
+
+    # Instructions split between two chunks start in the last bytes of the
+    # first one, at most the length of the longest instruction minus one
+    max_split_length = len("mul(123,456)") - 1
+
+    # Bytes of the raw input scanned at once
+    chunk_size: int = 1 << 20
+
+    ###########################
+    # DAY 03 - Common Part
+    ###########################
+
+    def parse(self) -> tuple[int, int, bool]:
+        """Raw input is scanned chunk by chunk instead of line by line. The end of
+        each chunk which may hold the beginning of an instruction is carried
+        over to the next chunk, unless it has already been matched.
+        """
+        state, carry = self._initial_state(), b""
+        for chunk in self._iter_chunks():
+            scanned = carry + chunk
+            state, scanned_until = self._scan(state, scanned)
+            carry = scanned[max(scanned_until, len(scanned) - self.max_split_length) :]
+        return state
+
+    def _iter_chunks(self) -> Generator[bytes, None, None]:
+        if self.data_file == STDIN_PATH:
+            while chunk := sys.stdin.buffer.read(self.chunk_size):
+                yield chunk
+            return
+
+        for start in range(0, len(self.data), self.chunk_size):
+            yield self.data[start : start + self.chunk_size]
+
+    def _initial_state(self) -> tuple[int, int, bool]:
+        """Sum of every multiplication, sum of the enabled ones only, and
+        whether instructions are enabled
+        """
+        return 0, 0, True
+
+    def _fold_line(
+        self, state: tuple[int, int, bool], line: str
+    ) -> tuple[int, int, bool]:
+        """Instructions enabling state is carried from one line to the next"""
+        state, _ = self._scan(state, line.encode())
+        return state
+
+    def _scan(
+        self, state: tuple[int, int, bool], scanned: bytes
+    ) -> tuple[tuple[int, int, bool], int]:
+        """Fold the instructions of some raw input into the state, along with
+        the position following the last matched instruction.
+        """
+        total, enabled_total, instructions_enabled = state
+        scanned_until = 0
+
+        for match in self.mul_pattern.finditer(scanned):
+            if (x := match.group(1)) and (y := match.group(2)):
+                result = int(x) * int(y)
+                total += result
+                if instructions_enabled:
+                    enabled_total += result
+            elif match.group(0) == b"don't()":
+                instructions_enabled = False
+            elif match.group(0) == b"do()":
+                instructions_enabled = True
+            scanned_until = match.end()
+
+        return (total, enabled_total, instructions_enabled), scanned_until
 
     ###########################
     # DAY 03 - First Part
     ###########################
 
     def _solve_first_part(self) -> int:
-        return sum(
-            int(result[0]) * int(result[1])
-            for line in self.lines
-            for result in re.findall(self.first_mul_pattern, line)
-        )
+        total, _, _ = self.parsed_input
+        return total
 
     ###########################
     # DAY 03 - Second Part
     ###########################
 
     def _solve_second_part(self) -> int:
-        total_sum = 0
-        instructions_enabled = True
-
-        for line in self.lines:
-            line_sum = 0
-
-            for match in self.second_mul_pattern.finditer(line):
-                if (
-                    instructions_enabled
-                    and (x := match.group(1))
-                    and (y := match.group(2))
-                ):
-                    line_sum += int(x) * int(y)
-                elif match.group(0) == "don't()":
-                    instructions_enabled = False
-                elif match.group(0) == "do()":
-                    instructions_enabled = True
-
-            total_sum += line_sum
-
-        return total_sum
+        _, enabled_total, _ = self.parsed_input
+        return enabled_total
+
+    ###########################
+    # DAY 03 - Input Generation
+    ###########################
+
+    corrupted_chars = "!@#$%^&*()[]{}<>?,;:'+-_/~ "
+    corrupted_instructions = ("mul", "mul(", "mul[", "do(", "don't", "what()", "why()")
+
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Lines of corrupted memory, mixing valid instructions with invalid
+        ones and random characters.
+        """
+        for _ in range(6 * scale):
+            tokens = []
+            while sum(map(len, tokens)) < 3000:
+                match rng.randrange(10):
+                    case 0 | 1 | 2:
+                        tokens.append(
+                            f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+                        )
+                    case 3:
+                        tokens.append(rng.choice(("do()", "don't()")))
+                    case 4 | 5:
+                        tokens.append(rng.choice(cls.corrupted_instructions))
+                    case _:
+                        tokens.append(
+                            "".join(
+                                rng.choices(cls.corrupted_chars, k=rng.randint(1, 4))
+                            )
+                        )
+            yield "".join(tokens)
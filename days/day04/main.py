@@ -1,44 +1,49 @@
-from functools import cache, cached_property
+import math
+import random
+from typing import Generator
 
+from scripts.grid import Grid
+from scripts.instrumentation import hot
 from scripts.utils import AbstractPuzzleSolver
 
 
 class PuzzleSolver(AbstractPuzzleSolver):
     xmas = "XMAS"
+    xmas_length = len(xmas)
+
+    # Values of the cells of "XMAS", as stored in the grid
+    xmas_values = xmas.encode()
+    cross_values = {ord("M"), ord("S")}
+
+    parsed_input: Grid
 
     ###########################
     # DAY 04 - Common Part
     ###########################
 
-    def solve(self) -> tuple[int, int]:
-        self.grid = Grid(self.lines)
-        self.xmas_length = len(self.xmas)
-        return super().solve()
+    def parse(self) -> Grid:
+        """Padding is large enough to look for XMAS from the borders"""
+        return Grid(self.lines, padding=self.xmas_length - 1)
 
     ###########################
     # DAY 04 - First Part
     ###########################
 
     def _solve_first_part(self) -> int:
-        return sum(
-            self._count_xmas_from(i, j)
-            for i, line in enumerate(self.lines)
-            for j, char in enumerate(line)
-            if char == "X"
-        )
+        grid = self.parsed_input
+        return sum(self._count_xmas_from(grid, index) for index in grid.find_all("X"))
 
-    def _count_xmas_from(self, i_pos: int, j_pos: int) -> int:
+    def _count_xmas_from(self, grid: Grid, index: int) -> int:
         return sum(
-            self._is_xmas(i_pos, j_pos, i_delta, j_delta)
-            for i_delta in (-1, 0, 1)
-            for j_delta in (-1, 0, 1)
-            if not (i_delta == 0 and j_delta == 0)
+            self._is_xmas(grid.data, index, offset)
+            for offset in grid.neighbours_offsets
         )
 
-    def _is_xmas(self, i_pos: int, j_pos: int, i_delta: int, j_delta: int) -> bool:
+    @hot
+    def _is_xmas(self, data: bytearray, index: int, offset: int) -> bool:
         return all(
-            self.xmas[i] == self.grid[i_pos + (i_delta * i)][j_pos + (j_delta * i)]
-            for i in range(0, self.xmas_length)
+            value == data[index + offset * i]
+            for i, value in enumerate(self.xmas_values)
         )
 
     ###########################
@@ -46,48 +51,35 @@ class PuzzleSolver(AbstractPuzzleSolver):
     ###########################
 
     def _solve_second_part(self) -> int:
-        return sum(
-            self._is_xmas_cross(i, j)
-            for i, line in enumerate(self.lines)
-            for j, char in enumerate(line)
-            if char == "A"
-        )
+        grid = self.parsed_input
+        return sum(self._is_xmas_cross(grid, index) for index in grid.find_all("A"))
+
+    @hot
+    def _is_xmas_cross(self, grid: Grid, index: int) -> bool:
+        data = grid.data
+        up_right, down_right, down_left, up_left = grid.diagonal_offsets
 
-    def _is_xmas_cross(self, i_pos: int, j_pos: int) -> bool:
         first_diagonal_is_ok = {
-            self.grid[i_pos - 1][j_pos - 1],
-            self.grid[i_pos + 1][j_pos + 1],
-        } == {"M", "S"}
+            data[index + up_left],
+            data[index + down_right],
+        } == self.cross_values
 
         second_diagonal_is_ok = {
-            self.grid[i_pos - 1][j_pos + 1],
-            self.grid[i_pos + 1][j_pos - 1],
-        } == {"M", "S"}
+            data[index + up_right],
+            data[index + down_left],
+        } == self.cross_values
 
         return first_diagonal_is_ok and second_diagonal_is_ok
 
+    ###########################
+    # DAY 04 - Input Generation
+    ###########################
 
-class Line:
-    def __init__(self, line: str | None):
-        self.line = line
-
-    @cached_property
-    def nb_chars(self) -> int:
-        return len(self.line)
-
-    @cache
-    def __getitem__(self, j_pos: int) -> str | None:
-        return self.line[j_pos] if self.line and (0 <= j_pos < self.nb_chars) else None
-
-
-class Grid:
-    def __init__(self, lines: list[str]):
-        self.lines: list[Line] = [Line(line) for line in lines]
-
-    @cached_property
-    def nb_lines(self) -> int:
-        return len(self.lines)
-
-    @cache
-    def __getitem__(self, i_pos: int) -> Line:
-        return self.lines[i_pos] if (0 <= i_pos < self.nb_lines) else Line(None)
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Square grid of random letters, its area growing with the scale"""
+        size = round(140 * math.sqrt(scale))
+        for _ in range(size):
+            yield "".join(rng.choices(cls.xmas, k=size))
@@ -1,34 +1,40 @@
+import math
+import random
 from dataclasses import dataclass
 from itertools import combinations
+from typing import Generator
 
+from scripts.instrumentation import hot
 from scripts.utils import AbstractPuzzleSolver
 
 
 class PuzzleSolver(AbstractPuzzleSolver):
-    # Input data
-    page_ordering_rules: set[tuple[int, int]]
-
-    # Computed data
-    valid_pages: list["PageList"]
-    invalid_pages: list["PageList"]
+    parsed_input: "PrintQueue"
 
     ###########################
     # DAY 05 - Common Part
     ###########################
 
-    def solve(self) -> tuple[int, int]:
+    def parse(self) -> "PrintQueue":
         """Common part includes pages retrieval and separation into valid/invalid"""
 
         # Retrieve input data
-        self.page_ordering_rules, pages_to_produce = self._retrieve_pages_data()
+        page_ordering_rules, pages_to_produce = self._retrieve_pages_data()
 
         # Separate valid pages and invalid pages
-        self._compute_pages_validity(pages_to_produce)
+        valid_pages, invalid_pages = self._compute_pages_validity(
+            page_ordering_rules, pages_to_produce
+        )
 
-        # Solve both parts
-        return super().solve()
+        return PrintQueue(
+            page_ordering_rules=page_ordering_rules,
+            valid_pages=valid_pages,
+            invalid_pages=invalid_pages,
+        )
 
-    def _retrieve_pages_data(self) -> list["PageList"]:
+    def _retrieve_pages_data(
+        self,
+    ) -> tuple[set[tuple[int, int]], list["PageList"]]:
         lines_iter = iter(self.lines)
         page_ordering_rules, pages_to_produce = set(), []
 
@@ -45,16 +51,21 @@ class PuzzleSolver(AbstractPuzzleSolver):
 
         return page_ordering_rules, pages_to_produce
 
-    def _compute_pages_validity(self, pages_to_produce: list["PageList"]) -> None:
+    def _compute_pages_validity(
+        self,
+        page_ordering_rules: set[tuple[int, int]],
+        pages_to_produce: list["PageList"],
+    ) -> tuple[list["PageList"], list["PageList"]]:
         """Compute pages validity only once for both parts of the puzzle"""
-        self.valid_pages, self.invalid_pages = [], []
+        valid_pages, invalid_pages = [], []
         for page_list in pages_to_produce:
             choosen_list = (
-                self.valid_pages
-                if page_list.is_order_valid(ordering_rules=self.page_ordering_rules)
-                else self.invalid_pages
+                valid_pages
+                if page_list.is_order_valid(ordering_rules=page_ordering_rules)
+                else invalid_pages
             )
             choosen_list.append(page_list)
+        return valid_pages, invalid_pages
 
     ###########################
     # DAY 05 - First Part
@@ -62,7 +73,7 @@ class PuzzleSolver(AbstractPuzzleSolver):
 
     def _solve_first_part(self) -> int:
         """Just return the sum of middle pages of valid pages"""
-        return sum(page_list.middle_page for page_list in self.valid_pages)
+        return sum(page_list.middle_page for page_list in self.parsed_input.valid_pages)
 
     ###########################
     # DAY 05 - Second Part
@@ -71,7 +82,7 @@ class PuzzleSolver(AbstractPuzzleSolver):
     def _solve_second_part(self) -> int:
         return sum(
             valid_page_list.middle_page
-            for page_list in self.invalid_pages
+            for page_list in self.parsed_input.invalid_pages
             if (valid_page_list := self._get_valid_page_ordering(page_list))
         )
 
@@ -81,7 +92,7 @@ class PuzzleSolver(AbstractPuzzleSolver):
         # Iterate over the combinations and invert number from first one
         # until there is no more invalid combination remaining
         while invalid_combinations := page_list.invalid_combinations(
-            self.page_ordering_rules
+            self.parsed_input.page_ordering_rules
         ):
             # Retrieve the next combination
             combination = next(iter(invalid_combinations))
@@ -97,6 +108,42 @@ class PuzzleSolver(AbstractPuzzleSolver):
 
         return page_list
 
+    ###########################
+    # DAY 05 - Input Generation
+    ###########################
+
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Pages follow a random total order, for which every ordering rule is
+        given. Updates are then drawn from these pages, half of them in a valid
+        order. More pages and updates are generated as the scale grows.
+        """
+        nb_pages = 49 * math.isqrt(scale)
+        pages_order = rng.sample(range(10, 10 + 2 * nb_pages), k=nb_pages)
+
+        ordering_rules = list(combinations(pages_order, 2))
+        rng.shuffle(ordering_rules)
+        for first_page, second_page in ordering_rules:
+            yield f"{first_page}|{second_page}"
+
+        yield ""
+
+        pages_ranks = {page: rank for rank, page in enumerate(pages_order)}
+        for _ in range(200 * scale):
+            pages = rng.sample(pages_order, k=rng.randrange(5, 24, 2))
+            if rng.random() < 0.5:
+                pages.sort(key=pages_ranks.__getitem__)
+            yield ",".join(map(str, pages))
+
+
+@dataclass
+class PrintQueue:
+    page_ordering_rules: set[tuple[int, int]]
+    valid_pages: list["PageList"]
+    invalid_pages: list["PageList"]
+
 
 @dataclass
 class PageList:
@@ -115,6 +162,7 @@ class PageList:
     def orders_combinations(self) -> set[tuple[int, int]]:
         return set(combinations(self.pages, 2))
 
+    @hot
     def invalid_combinations(
         self, ordering_rules: set[tuple[int, int]]
     ) -> set[tuple[int, int]]:
@@ -1,8 +1,12 @@
+import math
+import random
 from enum import StrEnum, auto
-from functools import cache, cached_property
+from functools import cached_property
 from itertools import cycle
 from typing import Generator
 
+from scripts.grid import Grid
+from scripts.instrumentation import hot
 from scripts.utils import AbstractPuzzleSolver
 
 
@@ -13,38 +17,44 @@ class Direction(StrEnum):
     LEFT = auto()
 
 
+class Cell(StrEnum):
+    EMPTY = "."
+    OBSTRUCTION = "#"
+    GUARD = "^"
+
+
 class PuzzleSolver(AbstractPuzzleSolver):
-    ###########################
-    # DAY 04 - Common Part
-    ###########################
-    direction_vectors: dict[Direction, tuple[int, int]] = {
-        Direction.UP: (-1, 0),
-        Direction.RIGHT: (0, 1),
-        Direction.DOWN: (1, 0),
-        Direction.LEFT: (0, -1),
-    }
+    # Second part puts obstructions in the grid while iterating over it
+    shared_mutable_state = True
 
-    def solve(self) -> tuple[int, int]:
-        self.grid = Grid(self.lines)
-        self.grid_nb_lines = self.grid.nb_lines
-        self.grid_nb_chars = self.grid.nb_chars
+    # Values of the cells, as stored in the grid
+    empty_value = ord(Cell.EMPTY)
+    obstruction_value = ord(Cell.OBSTRUCTION)
 
-        self.initial_guard_pos = self.grid.get_guard_pos()
+    parsed_input: "LabGrid"
 
-        return super().solve()
+    ###########################
+    # DAY 06 - Common Part
+    ###########################
 
-    def get_visited_positions(self, grid: "Grid") -> set[tuple[int, int]]:
-        guard = Guard(pos=self.initial_guard_pos)
+    def parse(self) -> "LabGrid":
+        return LabGrid(self.lines)
+
+    @classmethod
+    def get_visited_positions(cls, grid: "LabGrid") -> set[int]:
+        guard = Guard(pos=grid.guard_pos, grid=grid)
         visited_positions = {guard.pos}
+        data = grid.data
 
         # Iterate over guard positions
         while True:
             # Check next position, if it's outside the grid then stop
-            if not (next_pos := self._get_next_pos(guard)):
+            next_pos = guard.pos + guard.step
+            if data[next_pos] == Grid.OUTSIDE:
                 break
 
             # If it's an obstruction, just change the direction
-            if grid[next_pos] == Cell.OBSTRUCTION:
+            if data[next_pos] == cls.obstruction_value:
                 guard.turn_right()
                 continue
 
@@ -54,31 +64,12 @@ class PuzzleSolver(AbstractPuzzleSolver):
 
         return visited_positions
 
-    def _get_next_pos(self, guard: "Guard") -> tuple[int, int]:
-        return self._compute_next_pos(guard.pos, guard.direction)
-
-    @cache
-    def _compute_next_pos(
-        self, pos: tuple[int, int], direction: "Direction"
-    ) -> tuple[int, int]:
-        direction_vector = self.direction_vectors[direction]
-        next_pos = (
-            pos[0] + direction_vector[0],
-            pos[1] + direction_vector[1],
-        )
-        return (
-            next_pos
-            if 0 <= next_pos[0] < self.grid_nb_lines
-            and 0 <= next_pos[1] < self.grid_nb_chars
-            else None
-        )
-
     ###########################
     # DAY 06 - First Part
     ###########################
 
     def _solve_first_part(self) -> int:
-        return len(self.get_visited_positions(self.grid))
+        return len(self.get_visited_positions(self.parsed_input))
 
     ###########################
     # DAY 06 - Second Part
@@ -87,93 +78,114 @@ class PuzzleSolver(AbstractPuzzleSolver):
     def _solve_second_part(self) -> int:
         return sum(
             self.is_guard_stuck_in_loop(possible_grid)
-            for possible_grid in self.get_grid_combinations(self.grid)
+            for possible_grid in self.get_grid_combinations(self.parsed_input)
         )
 
-    def get_grid_combinations(self, grid: "Grid") -> Generator["Grid", None, None]:
+    def get_grid_combinations(
+        self, grid: "LabGrid"
+    ) -> Generator["LabGrid", None, None]:
         """Use positions computed in part 1 to iterate"""
         for empty_pos in self.get_visited_positions(grid):
-            grid[empty_pos] = Cell.OBSTRUCTION
+            grid.data[empty_pos] = self.obstruction_value
             yield grid
-            grid[empty_pos] = Cell.EMPTY
-
-    def is_guard_stuck_in_loop(self, grid: "Grid") -> int:
-        guard = Guard(pos=self.initial_guard_pos)
-        visited_positions: set[tuple[tuple[int, int], Direction]] = {
-            guard.pos,
-            guard.direction,
-        }
+            grid.data[empty_pos] = self.empty_value
+
+    @classmethod
+    @hot
+    def is_guard_stuck_in_loop(cls, grid: "LabGrid") -> bool:
+        """Only turns are recorded, as a guard stuck in a loop always ends up
+        turning again at the same position, in the same direction.
+        """
+        guard = Guard(pos=grid.guard_pos, grid=grid)
+        turns: set[tuple[int, Direction]] = set()
+        data = grid.data
 
         # Iterate over guard positions
         while True:
             # Check next position, if it's outside the grid then stop
-            if not (next_pos := self._get_next_pos(guard)):
+            next_pos = guard.pos + guard.step
+            if data[next_pos] == Grid.OUTSIDE:
                 break
 
-            # If next pos has already been visited in the same direction,
-            # guard is in a loop, we can stop here
-            if (next_pos, guard.direction) in visited_positions:
-                return True
+            # If it's an obstruction, change the direction. If guard already
+            # turned here in the same direction, he's stuck in a loop
+            if data[next_pos] == cls.obstruction_value:
+                if (guard.pos, guard.direction) in turns:
+                    return True
 
-            # If it's an obstruction, just change the direction
-            if grid[next_pos] == Cell.OBSTRUCTION:
+                turns.add((guard.pos, guard.direction))
                 guard.turn_right()
                 continue
 
-            # Else it's a valid move, update guard pos and counter
+            # Else it's a valid move, update guard pos
             guard.pos = next_pos
-            visited_positions.add((guard.pos, guard.direction))
 
         # Guard is now outside, he's not stuck in a loop
         return False
 
+    ###########################
+    # DAY 06 - Input Generation
+    ###########################
 
-class Cell(StrEnum):
-    EMPTY = "."
-    OBSTRUCTION = "#"
-    GUARD = "^"
-
-
-class Grid:
-    data: list[list[Cell]]
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Square grid with randomly placed obstructions, its area growing with
+        the scale. As guards quickly leave random grids, several grids are
+        generated and the one with the longest guard path is kept. Grids on
+        which the guard is stuck in a loop are discarded.
+        """
+        size = round(130 * math.sqrt(scale))
+        best_lines, best_path_length, nb_grids = None, 0, 0
+
+        while best_lines is None or nb_grids < 16:
+            nb_grids += 1
+            data = [
+                [
+                    Cell.OBSTRUCTION if rng.random() < 0.05 else Cell.EMPTY
+                    for _ in range(size)
+                ]
+                for _ in range(size)
+            ]
+            guard_pos = (rng.randrange(size), rng.randrange(size))
+            data[guard_pos[0]][guard_pos[1]] = Cell.GUARD
+
+            lines = ["".join(line) for line in data]
+            grid = LabGrid(lines)
+            if cls.is_guard_stuck_in_loop(grid):
+                continue
 
-    def __init__(self, lines: list[str]):
-        self.data = [[char for char in line] for line in lines]
+            path_length = len(cls.get_visited_positions(grid))
+            if path_length > best_path_length:
+                best_lines, best_path_length = lines, path_length
 
-    def __getitem__(self, index: tuple[int, int]) -> Cell | None:
-        return self.data[index[0]][index[1]]
+        yield from best_lines
 
-    def __setitem__(self, index: tuple[int, int], element: Cell) -> None:
-        self.data[index[0]][index[1]] = element
 
+class LabGrid(Grid):
     @cached_property
-    def nb_lines(self) -> int:
-        return len(self.data)
-
-    @cached_property
-    def nb_chars(self) -> int:
-        return len(self.data[0])
-
-    def get_guard_pos(self) -> tuple[int, int]:
-        return next(
-            (i, j)
-            for i, line in enumerate(self.data)
-            for j, char in enumerate(line)
-            if char == Cell.GUARD
-        )
+    def guard_pos(self) -> int:
+        return self.find(Cell.GUARD)
 
 
 class Guard:
-    directions_cycle: Generator[Direction, None, None]
+    directions_cycle: Generator[tuple[Direction, int], None, None]
     direction: Direction
-    pos: tuple[int, int]
+    step: int
+    pos: int
 
-    def __init__(self, pos: tuple[int, int]):
+    def __init__(self, pos: int, grid: Grid):
         self.pos = pos
+
+        # Step is the offset of a move in the current direction
         self.directions_cycle = cycle(
-            [Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT]
+            zip(
+                [Direction.UP, Direction.RIGHT, Direction.DOWN, Direction.LEFT],
+                grid.orthogonal_offsets,
+            )
         )
-        self.direction = next(self.directions_cycle)
+        self.direction, self.step = next(self.directions_cycle)
 
     def turn_right(self) -> None:
-        self.direction = next(self.directions_cycle)
+        self.direction, self.step = next(self.directions_cycle)
@@ -1,37 +1,58 @@
 import operator
+import random
 from itertools import product
 from typing import Callable, Generator
 
-from scripts.utils import AbstractPuzzleSolver
+from scripts.instrumentation import hot
+from scripts.utils import MapReducePuzzleSolver
 
 
-class PuzzleSolver(AbstractPuzzleSolver):
+class PuzzleSolver(MapReducePuzzleSolver):
     ###########################
     # DAY 07 - Common Part
     ###########################
 
-    def get_total_calibration_result(self, operators: list[Callable]) -> int:
-        return sum(
-            Equation(line).get_nb_possibilities(operators) for line in self.lines
+    def _initial_state(self) -> tuple[int, int]:
+        """Total calibration results of both parts"""
+        return 0, 0
+
+    def _map_line(self, line: str) -> tuple[int, int]:
+        if not line:
+            return 0, 0
+
+        equation = Equation(line)
+
+        # Operators of the second part include the ones of the first part, so
+        # an equation which can be true in the first part can be in the second
+        first_result = equation.get_nb_possibilities(self.first_part_operators)
+        second_result = first_result or equation.get_nb_possibilities(
+            self.second_part_operators
         )
+        return first_result, second_result
+
+    def _reduce(
+        self, first: tuple[int, int], second: tuple[int, int]
+    ) -> tuple[int, int]:
+        return first[0] + second[0], first[1] + second[1]
 
     ###########################
     # DAY 07 - First Part
     ###########################
 
+    first_part_operators = [operator.add, operator.mul]
+
     def _solve_first_part(self) -> int:
-        return self.get_total_calibration_result([operator.add, operator.mul])
+        return self.parsed_input[0]
 
     ###########################
     # DAY 07 - Second Part
     ###########################
 
     def _solve_second_part(self) -> int:
-        return self.get_total_calibration_result(
-            [operator.add, operator.mul, self.concat]
-        )
+        return self.parsed_input[1]
 
     @staticmethod
+    @hot
     def concat(first_number: int, second_number: int) -> int:
         """Concatenate two integers as is they were strings"""
 
@@ -43,6 +64,35 @@ class PuzzleSolver(AbstractPuzzleSolver):
         # Then multiply by power of ten and add the second number
         return first_number * 10**digits + second_number
 
+    second_part_operators = [operator.add, operator.mul, concat]
+
+    ###########################
+    # DAY 07 - Input Generation
+    ###########################
+
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Test values are computed with random operators, and sometimes shifted
+        so that some equations can't be true.
+        """
+        operators = [operator.add, operator.mul, cls.concat]
+        for _ in range(850 * scale):
+            numbers = [
+                rng.randint(1, 999 if rng.random() < 0.2 else 99)
+                for _ in range(rng.randint(2, 12))
+            ]
+
+            test_value = numbers[0]
+            for number in numbers[1:]:
+                test_value = rng.choice(operators)(test_value, number)
+
+            if rng.random() < 0.3:
+                test_value += rng.randint(1, 10)
+
+            yield f"{test_value}: {' '.join(map(str, numbers))}"
+
 
 class Equation:
     test_value: int
@@ -68,6 +118,7 @@ class Equation:
             else 0
         )
 
+    @hot
     def _are_valid_operators(self, operators: Generator[Callable, None, None]) -> bool:
         """Loop over operators and apply operations. As we only have operators
         that will increase the value, we'll stop early if the value is already
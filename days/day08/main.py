@@ -1,8 +1,12 @@
-from collections import defaultdict
-from dataclasses import dataclass
-from functools import cache, cached_property
+import math
+import random
+import string
+from functools import cached_property
 from itertools import combinations
+from typing import Generator
 
+from scripts.grid import Coordinate, Grid
+from scripts.instrumentation import hot
 from scripts.utils import AbstractPuzzleSolver
 
 
@@ -11,61 +15,53 @@ class PuzzleSolver(AbstractPuzzleSolver):
     # DAY 08 - Common Part
     ###########################
 
-    def solve(self) -> tuple[int, int]:
-        self.grid = Grid(self.lines)
-        self.grid_nb_lines = self.grid.nb_lines
-        self.grid_nb_chars = self.grid.nb_chars
-        return super().solve()
+    parsed_input: "AntennasGrid"
+
+    def parse(self) -> "AntennasGrid":
+        return AntennasGrid(self.lines)
 
     def _get_antinodes(
-        self, antennas: set["Position"], in_line: bool = False
-    ) -> set["Position"]:
+        self, antennas: set[Coordinate], in_line: bool = False
+    ) -> set[Coordinate]:
+        """Antinodes are found as flat indexes of the grid, only the distinct
+        ones being turned into (interned) coordinates.
+        """
         antennas_combinations = combinations(antennas, 2)
-        return {
-            antinode
+        antinodes_indexes = {
+            antinode_index
             for positions in antennas_combinations
-            for antinode in self._get_antinodes_positions(positions, in_line=in_line)
-        }
-
-    def _get_antinodes_positions(
-        self, positions: tuple["Position", "Position"], in_line: bool = False
-    ) -> set["Position"]:
-        antinode_positions: set["Position"] = set()
-        update_vectors: tuple["Position", "Position"] = (
-            positions[1] - positions[0],
-            positions[0] - positions[1],
-        )
-
-        previous_positions = positions
-
-        # Generate the antinodes until limit is reached in both ways or
-        # stop after first iteration if we're not generating an entire line
-        while True:
-            # Calculate new position
-            new_positions = (
-                previous_positions[0] + update_vectors[0],
-                previous_positions[1] + update_vectors[1],
+            for antinode_index in self._get_antinodes_indexes(
+                positions, in_line=in_line
             )
+        }
+        return {
+            self.parsed_input.cell_coordinate(antinode_index)
+            for antinode_index in antinodes_indexes
+        }
 
-            # Compute valid positions and update antinode_positions
-            valid_positions = {pos for pos in new_positions if self._is_in_grid(pos)}
-            antinode_positions |= valid_positions
-
-            # Stop if there is no valid position or if we should stop after first iteration
-            if len(valid_positions) == 0 or not in_line:
-                break
-
-            # Update for next iteration
-            previous_positions = new_positions
-
-        return antinode_positions
-
-    @cache
-    def _is_in_grid(self, position: "Position") -> bool:
-        return (
-            0 <= position.x < self.grid_nb_lines
-            and 0 <= position.y < self.grid_nb_chars
-        )
+    @hot
+    def _get_antinodes_indexes(
+        self, positions: tuple[Coordinate, Coordinate], in_line: bool = False
+    ) -> set[int]:
+        antinodes_indexes: set[int] = set()
+        grid = self.parsed_input
+        first, second = positions
+        x_step, y_step = second.x - first.x, second.y - first.y
+
+        # Move each antenna away from the other one on plain integers, until
+        # it leaves the grid or after first move if we're not generating an
+        # entire line
+        for x, y, x_step, y_step in (
+            (first.x + x_step, first.y + y_step, x_step, y_step),
+            (second.x - x_step, second.y - y_step, -x_step, -y_step),
+        ):
+            while 0 <= x < grid.nb_lines and 0 <= y < grid.nb_chars:
+                antinodes_indexes.add(grid.index(x, y))
+                if not in_line:
+                    break
+                x, y = x + x_step, y + y_step
+
+        return antinodes_indexes
 
     ###########################
     # DAY 08 - First Part
@@ -75,7 +71,7 @@ class PuzzleSolver(AbstractPuzzleSolver):
         return len(
             {
                 antinode
-                for antennas in self.grid.antennas_positions.values()
+                for antennas in self.parsed_input.antennas_positions.values()
                 for antinode in self._get_antinodes(antennas)
             }
         )
@@ -88,49 +84,39 @@ class PuzzleSolver(AbstractPuzzleSolver):
         return len(
             {
                 antinode
-                for antennas in self.grid.antennas_positions.values()
+                for antennas in self.parsed_input.antennas_positions.values()
                 for antinode in self._get_antinodes(antennas, in_line=True)
             }
         )
 
+    ###########################
+    # DAY 08 - Input Generation
+    ###########################
 
-@dataclass
-class Position:
-    x: int
-    y: int
-
-    def __hash__(self):
-        return hash((self.x, self.y))
-
-    def __eq__(self, other: "Position"):
-        return self.x == other.x and self.y == other.y
-
-    def __add__(self, other: "Position") -> "Position":
-        return Position(x=self.x + other.x, y=self.y + other.y)
-
-    def __sub__(self, other: "Position") -> "Position":
-        return Position(x=self.x - other.x, y=self.y - other.y)
-
-
-class Grid:
-    data: list[list[str]]
+    @classmethod
+    def generate_input(
+        cls, scale: int, rng: random.Random
+    ) -> Generator[str, None, None]:
+        """Square grid with randomly placed antennas, its area and the number of
+        antennas growing with the scale.
+        """
+        size = round(50 * math.sqrt(scale))
+        data = [["."] * size for _ in range(size)]
 
-    def __init__(self, lines: list[str]):
-        self.data = [[char for char in line] for line in lines]
+        frequencies = string.ascii_letters + string.digits
+        for cell in rng.sample(range(size * size), k=200 * scale):
+            data[cell // size][cell % size] = rng.choice(frequencies)
 
-    @cached_property
-    def nb_lines(self) -> int:
-        return len(self.data)
+        for line in data:
+            yield "".join(line)
 
-    @cached_property
-    def nb_chars(self) -> int:
-        return len(self.data[0])
 
+class AntennasGrid(Grid):
     @cached_property
-    def antennas_positions(self) -> dict[str, set[Position]]:
-        antennas = defaultdict(set)
-        for i, line in enumerate(self.data):
-            for j, char in enumerate(line):
-                if char != ".":
-                    antennas[char].add(Position(x=i, y=j))
-        return dict(antennas)
+    def antennas_positions(self) -> dict[str, set[Coordinate]]:
+        antennas_positions: dict[str, set[Coordinate]] = {}
+        for frequency in self.values() - {"."}:
+            antennas_positions[frequency] = set()
+            for index in self.find_all(frequency):
+                antennas_positions[frequency].add(self.cell_coordinate(index))
+        return antennas_positions
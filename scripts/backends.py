@@ -0,0 +1,46 @@
+import importlib.util
+from enum import StrEnum
+
+
+class Backend(StrEnum):
+    # Input handled one line at a time, in pure Python
+    PYTHON = "python"
+    # Values stored in compact arrays of C integers, and processed at C speed
+    ARRAY = "array"
+    # Values stored in NumPy arrays, and processed with vectorized operations
+    NUMPY = "numpy"
+
+
+# Optional dependency needed by each backend (see pyproject.toml)
+BACKEND_MODULES = {Backend.NUMPY: "numpy"}
+
+
+def is_available(backend: Backend) -> bool:
+    module = BACKEND_MODULES.get(backend)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def select_backend(
+    backends: tuple[Backend, ...],
+    input_size: int,
+    big_input_threshold: int,
+    requested: Backend | None = None,
+) -> Backend:
+    """Backends of a solver are ordered from the default one to the fastest one.
+    The requested backend is used if available, the previous ones being used as
+    fallbacks. Otherwise, the fastest available one is used for big inputs only,
+    as importing its dependencies costs more than it saves on smaller ones.
+    """
+    if requested is not None:
+        if requested not in backends:
+            raise ValueError(
+                f"Backend {requested} isn't supported, use one of "
+                f"{', '.join(backends)}"
+            )
+        candidates = backends[: backends.index(requested) + 1]
+    elif input_size >= big_input_threshold:
+        candidates = backends
+    else:
+        candidates = backends[:1]
+
+    return next(backend for backend in reversed(candidates) if is_available(backend))
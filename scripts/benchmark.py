@@ -0,0 +1,119 @@
+import importlib
+import json
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator
+
+from scripts.utils import DataType, Phase
+
+# Whole solving of the puzzle, including any common part of the solver
+TOTAL = "total"
+
+
+class PhaseTimer:
+    """Phase hook recording the duration of each phase of the puzzle solving"""
+
+    def __init__(self):
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    @contextmanager
+    def __call__(self, phase: Phase | str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[str(phase)].append(time.perf_counter() - start)
+
+
+@dataclass
+class Regression:
+    day: int
+    phase: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def compute_stats(durations: list[float]) -> dict[str, float]:
+    return {
+        "min": min(durations),
+        "median": statistics.median(durations),
+        "p95": (
+            statistics.quantiles(durations, n=20, method="inclusive")[-1]
+            if len(durations) > 1
+            else durations[0]
+        ),
+        "stddev": statistics.stdev(durations) if len(durations) > 1 else 0.0,
+    }
+
+
+def benchmark_day(
+    day: int, data_type: DataType, warmups: int, repeats: int
+) -> dict[str, dict[str, float]]:
+    """Time the loading and both parts of the puzzle solver of a given day
+    separately. Warmup runs are executed first and not recorded. A new solver
+    is instanciated for each run, so that nothing is kept between them.
+    """
+    day_module = importlib.import_module(f"days.day{day:02d}.main")
+
+    for _ in range(warmups):
+        day_module.PuzzleSolver(day=day, data_type=data_type, verbose=False).solve()
+
+    timer = PhaseTimer()
+    for _ in range(repeats):
+        with timer(TOTAL):
+            day_module.PuzzleSolver(
+                day=day, data_type=data_type, verbose=False, phase_hook=timer
+            ).solve()
+
+    return {
+        phase: compute_stats(durations) for phase, durations in timer.durations.items()
+    }
+
+
+def load_benchmark(file_path: Path) -> dict:
+    return json.loads(file_path.read_text())
+
+
+def save_benchmark(file_path: Path, benchmark: dict) -> None:
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(json.dumps(benchmark, indent=2))
+
+
+def find_regressions(
+    benchmark: dict, baseline: dict, threshold: float, noise_floor: float = 0.001
+) -> list[Regression]:
+    """Compare minimum timings of every day and phase with the baseline ones,
+    as noise only ever adds time to a run. A regression is reported when the
+    minimum is slower than the baseline by more than the given threshold (ex:
+    0.2 for 20%), and by more than the noise floor (in seconds), as phases
+    taking microseconds vary much more than that.
+    """
+    regressions = []
+    for day, phases in benchmark["days"].items():
+        baseline_phases = baseline["days"].get(day, {})
+        for phase, stats in phases.items():
+            if phase not in baseline_phases:
+                continue
+
+            baseline_min = baseline_phases[phase]["min"]
+            if (
+                stats["min"] > baseline_min * (1 + threshold)
+                and stats["min"] - baseline_min > noise_floor
+            ):
+                regressions.append(
+                    Regression(
+                        day=int(day),
+                        phase=phase,
+                        baseline=baseline_min,
+                        current=stats["min"],
+                    )
+                )
+    return regressions
@@ -0,0 +1,129 @@
+import json
+import pickle
+import sqlite3
+import time
+from contextlib import closing
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+
+CACHE_PATH = Path(__file__).parent.parent / ".cache"
+PARSED_INPUTS_PATH = CACHE_PATH / "parsed_inputs"
+
+# Returned when nothing is cached for a key, as None is a valid cached value
+MISSING = object()
+
+
+def load_parsed_input(prefix: str, key: str) -> Any:
+    cache_file = PARSED_INPUTS_PATH / f"{prefix}-{key}.pickle"
+    try:
+        with cache_file.open("rb") as file:
+            return pickle.load(file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return MISSING
+
+
+def save_parsed_input(prefix: str, key: str, parsed_input: Any) -> None:
+    """Save the parsed input, and remove the ones previously cached with the
+    same prefix, as they won't be used anymore.
+    """
+    PARSED_INPUTS_PATH.mkdir(parents=True, exist_ok=True)
+    for outdated_file in PARSED_INPUTS_PATH.glob(f"{prefix}-*.pickle"):
+        outdated_file.unlink(missing_ok=True)
+
+    cache_file = PARSED_INPUTS_PATH / f"{prefix}-{key}.pickle"
+    temporary_file = cache_file.with_suffix(".tmp")
+    with temporary_file.open("wb") as file:
+        pickle.dump(parsed_input, file, protocol=pickle.HIGHEST_PROTOCOL)
+    temporary_file.replace(cache_file)
+
+
+class AnswerCache:
+    """Persistent cache of puzzle results, keyed by day, data type, and hashes
+    of both the input and the solver code. Least recently used entries are
+    evicted once there are too many of them, or when they're too old.
+    """
+
+    database_path = CACHE_PATH / "answers.sqlite3"
+    max_entries = 500
+    max_age = timedelta(days=30)
+
+    def __init__(self):
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS answers (
+                        day INTEGER NOT NULL,
+                        data_type TEXT NOT NULL,
+                        input_hash TEXT NOT NULL,
+                        source_hash TEXT NOT NULL,
+                        results TEXT NOT NULL,
+                        last_used_at REAL NOT NULL,
+                        PRIMARY KEY (day, data_type, input_hash, source_hash)
+                    )
+                    """
+                )
+
+    def get(
+        self, day: int, data_type: str, input_hash: str, source_hash: str
+    ) -> tuple[int, int] | None:
+        key = (day, data_type, input_hash, source_hash)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                row = connection.execute(
+                    """
+                    SELECT results FROM answers WHERE
+                    day = ? AND data_type = ? AND input_hash = ? AND source_hash = ?
+                    """,
+                    key,
+                ).fetchone()
+                if row is None:
+                    return None
+
+                connection.execute(
+                    """
+                    UPDATE answers SET last_used_at = ? WHERE
+                    day = ? AND data_type = ? AND input_hash = ? AND source_hash = ?
+                    """,
+                    (time.time(), *key),
+                )
+        return tuple(json.loads(row[0]))
+
+    def set(
+        self,
+        day: int,
+        data_type: str,
+        input_hash: str,
+        source_hash: str,
+        results: tuple[int, int],
+    ) -> None:
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        day,
+                        data_type,
+                        input_hash,
+                        source_hash,
+                        json.dumps(results),
+                        time.time(),
+                    ),
+                )
+                self._evict(connection)
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        connection.execute(
+            "DELETE FROM answers WHERE last_used_at < ?",
+            (time.time() - self.max_age.total_seconds(),),
+        )
+        connection.execute(
+            """
+            DELETE FROM answers WHERE rowid NOT IN (
+                SELECT rowid FROM answers ORDER BY last_used_at DESC LIMIT ?
+            )
+            """,
+            (self.max_entries,),
+        )
@@ -0,0 +1,111 @@
+"""Equivalence checks of the optimized code paths against straightforward ones,
+on random inputs. Run them with `python -m scripts.checks`.
+"""
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+from rich import print
+
+from scripts.backends import Backend, is_available
+from scripts.utils import DataType
+
+
+def check_day02_tolerance(rng: random.Random, nb_reports: int) -> int:
+    """Linear bad level tolerance check against removing each level in turn"""
+    from days.day02.main import Report
+
+    nb_mismatches = 0
+    for _ in range(nb_reports):
+        levels = [rng.randint(1, 9) for _ in range(rng.randint(1, 8))]
+        report = Report(levels)
+        expected = any(
+            Report(levels[:index] + levels[index + 1 :]).is_stable
+            for index in range(len(levels))
+        )
+        if report.is_stable_by_tolerating_bad_level != expected:
+            print(f"[red]Day 2 tolerance mismatch on {levels}[/red]")
+            nb_mismatches += 1
+    return nb_mismatches
+
+
+def check_day02_batch(rng: random.Random, nb_reports: int) -> int:
+    """Vectorized checks of every report at once against per-report ones"""
+    from days.day02.main import Report, ReportsBatch
+
+    reports_levels = [
+        [rng.randint(1, 9) for _ in range(rng.randint(1, 8))] for _ in range(nb_reports)
+    ]
+    data = "\n".join(" ".join(map(str, levels)) for levels in reports_levels)
+    reports_batch = ReportsBatch.from_data(data.encode())
+
+    nb_mismatches = 0
+    for levels, is_stable, is_stable_by_tolerating_bad_level in zip(
+        reports_levels,
+        reports_batch.are_stable(),
+        reports_batch.are_stable_by_tolerating_bad_level(),
+    ):
+        report = Report(levels)
+        if (is_stable, is_stable_by_tolerating_bad_level) != (
+            report.is_stable,
+            report.is_stable_by_tolerating_bad_level,
+        ):
+            print(f"[red]Day 2 batch mismatch on {levels}[/red]")
+            nb_mismatches += 1
+    return nb_mismatches
+
+
+def check_day03_chunks(rng: random.Random, max_chunk_size: int) -> int:
+    """Chunked scan against a scan of the whole input at once, with chunks small
+    enough for instructions to be split at every possible position.
+    """
+    from days.day03.main import PuzzleSolver
+
+    nb_mismatches = 0
+    with tempfile.TemporaryDirectory() as temporary_path:
+        data_file = Path(temporary_path) / "input.txt"
+        data_file.write_text(
+            "\n".join(PuzzleSolver.generate_input(scale=1, rng=rng)) + "\n"
+        )
+
+        puzzle_solver = PuzzleSolver(
+            day=3, data_type=DataType.INPUT, verbose=False, data_file=data_file
+        )
+        expected, _ = puzzle_solver._scan(
+            puzzle_solver._initial_state(), puzzle_solver.data[:]
+        )
+        for chunk_size in range(1, max_chunk_size + 1):
+            puzzle_solver.chunk_size = chunk_size
+            if (state := puzzle_solver.parse()) != expected:
+                print(
+                    f"[red]Day 3 mismatch with chunks of {chunk_size} bytes : "
+                    f"{state} instead of {expected}[/red]"
+                )
+                nb_mismatches += 1
+    return nb_mismatches
+
+
+def main(seed: int = 0) -> None:
+    rng = random.Random(seed)
+
+    nb_mismatches = check_day02_tolerance(rng, nb_reports=100_000)
+    print(f"Day 2 linear tolerance check : {nb_mismatches} mismatches")
+
+    if is_available(Backend.NUMPY):
+        nb_mismatches += (batch_mismatches := check_day02_batch(rng, 100_000))
+        print(f"Day 2 vectorized checks : {batch_mismatches} mismatches")
+    else:
+        print("[yellow]NumPy isn't installed, day 2 batch not checked[/yellow]")
+
+    nb_mismatches += (chunks_mismatches := check_day03_chunks(rng, 32))
+    print(f"Day 3 chunked scan : {chunks_mismatches} mismatches")
+
+    if nb_mismatches:
+        sys.exit(1)
+    print("[green]Every check passed ![/green]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from enum import StrEnum, auto
+from pathlib import Path
+
+import httpx
+
+from scripts.cache import CACHE_PATH
+
+DAYS_PATH = Path(__file__).parent.parent / "days"
+INPUTS_CACHE_PATH = CACHE_PATH / "inputs"
+
+USER_AGENT = "github.com/TeKrop/advent-of-code-2024"
+
+# Statuses for which the request is worth retrying after a while
+RETRYABLE_STATUSES = {
+    httpx.codes.TOO_MANY_REQUESTS,
+    httpx.codes.INTERNAL_SERVER_ERROR,
+    httpx.codes.BAD_GATEWAY,
+    httpx.codes.SERVICE_UNAVAILABLE,
+    httpx.codes.GATEWAY_TIMEOUT,
+}
+
+
+class FetchStatus(StrEnum):
+    DOWNLOADED = auto()
+    UNCHANGED = auto()
+    FAILED = auto()
+
+
+@dataclass
+class FetchResult:
+    day: int
+    status: FetchStatus
+    error: str | None = None
+
+
+def create_client(session_id: str, max_connections: int) -> httpx.AsyncClient:
+    """Single client shared by every request, pooling its connections"""
+    return httpx.AsyncClient(
+        base_url=os.getenv("AOC_BASE_URL", ""),
+        cookies={"session": session_id},
+        headers={"User-Agent": USER_AGENT},
+        limits=httpx.Limits(max_connections=max_connections),
+        timeout=httpx.Timeout(10.0),
+    )
+
+
+async def request_with_retries(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retries: int = 3,
+    backoff: float = 1.0,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request, retrying with an exponential backoff on network errors
+    and on statuses indicating a temporary failure. Only idempotent requests
+    must be sent this way, as a failed request may have reached the server.
+    """
+    for attempt in range(retries + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUSES or attempt == retries:
+                return response
+
+        await asyncio.sleep(backoff * 2**attempt)
+
+
+async def fetch_input(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, day: int
+) -> FetchResult:
+    """Download the input of a given day into its input.txt file. A conditional
+    request is made if the input has already been downloaded, so that it's not
+    downloaded again if unchanged.
+    """
+    content_file = INPUTS_CACHE_PATH / f"day{day:02d}.txt"
+    metadata_file = INPUTS_CACHE_PATH / f"day{day:02d}.json"
+
+    headers = {}
+    if content_file.exists() and metadata_file.exists():
+        metadata = json.loads(metadata_file.read_text())
+        if etag := metadata.get("etag"):
+            headers["If-None-Match"] = etag
+        if last_modified := metadata.get("last_modified"):
+            headers["If-Modified-Since"] = last_modified
+
+    try:
+        async with semaphore:
+            response = await request_with_retries(
+                client, "GET", f"/day/{day}/input", headers=headers
+            )
+    except httpx.HTTPError as error:
+        return FetchResult(day=day, status=FetchStatus.FAILED, error=repr(error))
+
+    if response.status_code == httpx.codes.NOT_MODIFIED:
+        status = FetchStatus.UNCHANGED
+    elif response.status_code == httpx.codes.OK:
+        status = FetchStatus.DOWNLOADED
+        INPUTS_CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        content_file.write_text(response.text, encoding="utf-8")
+        metadata_file.write_text(
+            json.dumps(
+                {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                }
+            )
+        )
+    else:
+        return FetchResult(
+            day=day, status=FetchStatus.FAILED, error=f"HTTP {response.status_code}"
+        )
+
+    # Make sure the input file of the day is up to date with the cached one
+    input_file = DAYS_PATH / f"day{day:02d}" / "input.txt"
+    content = content_file.read_text(encoding="utf-8")
+    if not input_file.exists() or input_file.read_text(encoding="utf-8") != content:
+        input_file.parent.mkdir(parents=True, exist_ok=True)
+        input_file.write_text(content, encoding="utf-8")
+
+    return FetchResult(day=day, status=status)
+
+
+async def fetch_inputs(
+    days: list[int], session_id: str, concurrency: int
+) -> list[FetchResult]:
+    """Download the inputs of several days concurrently, with a bounded number
+    of requests in flight at the same time.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with create_client(session_id, max_connections=concurrency) as client:
+        return await asyncio.gather(
+            *(fetch_input(client, semaphore, day) for day in days)
+        )
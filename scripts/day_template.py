@@ -2,6 +2,13 @@ from scripts.utils import AbstractPuzzleSolver
 
 
 class PuzzleSolver(AbstractPuzzleSolver):
+    ###########################
+    # DAY X - Common Part
+    ###########################
+
+    def parse(self) -> None:
+        return None
+
     ###########################
     # DAY X - First Part
     ###########################
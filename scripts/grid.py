@@ -0,0 +1,137 @@
+class Coordinate:
+    """Position in a grid, or difference between two positions. Coordinates are
+    read-only, compared and hashed on their value, the hash being computed once
+    when first needed. Cells of a grid are interned by it (see Grid.coordinate),
+    so comparing them mostly stops at their identity.
+    """
+
+    __slots__ = ("x", "y", "_hash")
+
+    x: int
+    y: int
+
+    def __init__(self, x: int, y: int):
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f"Coordinate is read-only, {name} can't be set")
+
+    def __reduce__(self) -> tuple[type, tuple[int, int]]:
+        return Coordinate, (self.x, self.y)
+
+    def __repr__(self) -> str:
+        return f"Coordinate(x={self.x}, y={self.y})"
+
+    def __eq__(self, other: object) -> bool:
+        return self is other or (
+            isinstance(other, Coordinate) and self.x == other.x and self.y == other.y
+        )
+
+    def __hash__(self) -> int:
+        try:
+            return self._hash
+        except AttributeError:
+            object.__setattr__(self, "_hash", hash((self.x, self.y)))
+            return self._hash
+
+    def __add__(self, other: "Coordinate") -> "Coordinate":
+        return Coordinate(self.x + other.x, self.y + other.y)
+
+    def __sub__(self, other: "Coordinate") -> "Coordinate":
+        return Coordinate(self.x - other.x, self.y - other.y)
+
+
+class Grid:
+    """Grid of characters stored in a flat bytearray, one byte per cell, and
+    addressed by flat indexes. The grid is surrounded by a border of sentinel
+    cells, so that leaving the grid is detected by reading the next cell, without
+    any bounds check (as long as moves don't go further than the padding).
+    """
+
+    # Value of the sentinel cells surrounding the grid
+    OUTSIDE = 0
+
+    data: bytearray
+    nb_lines: int
+    nb_chars: int
+    padding: int
+    width: int
+
+    # Interned coordinates of the cells of the grid, by flat index
+    coordinates: dict[int, Coordinate]
+
+    def __init__(self, lines: list[str], padding: int = 1):
+        self.coordinates = {}
+        self.nb_lines = len(lines)
+        self.nb_chars = len(lines[0]) if lines else 0
+        self.padding = padding
+        self.width = self.nb_chars + 2 * padding
+
+        border, side = bytes(self.width * padding), bytes(padding)
+        rows = (side + line.encode() + side for line in lines)
+        self.data = bytearray(b"".join((border, *rows, border)))
+
+        # Flat offsets of a step in each direction, clockwise from up
+        self.orthogonal_offsets = [
+            self.offset(-1, 0),
+            self.offset(0, 1),
+            self.offset(1, 0),
+            self.offset(0, -1),
+        ]
+        self.diagonal_offsets = [
+            self.offset(-1, 1),
+            self.offset(1, 1),
+            self.offset(1, -1),
+            self.offset(-1, -1),
+        ]
+        self.neighbours_offsets = self.orthogonal_offsets + self.diagonal_offsets
+
+    def offset(self, i_delta: int, j_delta: int) -> int:
+        return i_delta * self.width + j_delta
+
+    def index(self, i_pos: int, j_pos: int) -> int:
+        return (i_pos + self.padding) * self.width + j_pos + self.padding
+
+    def position(self, index: int) -> tuple[int, int]:
+        i_pos, j_pos = divmod(index, self.width)
+        return i_pos - self.padding, j_pos - self.padding
+
+    def contains(self, i_pos: int, j_pos: int) -> bool:
+        return 0 <= i_pos < self.nb_lines and 0 <= j_pos < self.nb_chars
+
+    def coordinate(self, i_pos: int, j_pos: int) -> Coordinate:
+        """Coordinate of a cell, interned so that each cell of the grid maps to a
+        single object, freed along with the grid. Positions outside of the grid
+        aren't interned, as there is no bound to their number.
+        """
+        if not self.contains(i_pos, j_pos):
+            return Coordinate(i_pos, j_pos)
+        return self.cell_coordinate(self.index(i_pos, j_pos))
+
+    def cell_coordinate(self, index: int) -> Coordinate:
+        """Interned coordinate of the cell at a flat index of the grid, which is
+        only built the first time it's needed
+        """
+        if (coordinate := self.coordinates.get(index)) is None:
+            coordinate = self.coordinates[index] = Coordinate(*self.position(index))
+        return coordinate
+
+    def values(self) -> set[str]:
+        """Distinct values of the cells of the grid"""
+        return {chr(value) for value in set(self.data) if value != self.OUTSIDE}
+
+    def find(self, char: str) -> int:
+        """Index of the first cell of the given value, or -1 if there is none"""
+        return self.data.find(ord(char))
+
+    def find_all(self, char: str) -> list[int]:
+        """Indexes of every cell of the given value. Searching the buffer skips
+        other cells at C speed, instead of checking them one by one.
+        """
+        value, indexes = ord(char), []
+        index = self.data.find(value)
+        while index != -1:
+            indexes.append(index)
+            index = self.data.find(value, index + 1)
+        return indexes
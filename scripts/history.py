@@ -0,0 +1,148 @@
+import hashlib
+import platform
+import sqlite3
+import subprocess
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent.parent
+
+
+@dataclass
+class HistoryPoint:
+    commit: str
+    python_version: str
+    input_hash: str
+
+    # Best median over the benchmark runs made on this commit
+    median: float
+    nb_runs: int
+
+    # Ratio with the median of the previous comparable point, if any
+    ratio: float | None = None
+
+
+class BenchmarkHistory:
+    """Persistent history of benchmark timings, recorded with the commit, the
+    Python version and the input they've been measured on, so that trends can
+    be followed from one commit to another.
+    """
+
+    database_path = ROOT_PATH / ".benchmarks" / "history.sqlite3"
+
+    def __init__(self):
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS timings (
+                        recorded_at REAL NOT NULL,
+                        commit_hash TEXT NOT NULL,
+                        python_version TEXT NOT NULL,
+                        data_type TEXT NOT NULL,
+                        day INTEGER NOT NULL,
+                        phase TEXT NOT NULL,
+                        input_hash TEXT NOT NULL,
+                        min REAL NOT NULL,
+                        median REAL NOT NULL,
+                        p95 REAL NOT NULL,
+                        stddev REAL NOT NULL
+                    )
+                    """
+                )
+
+    def record(
+        self,
+        day: int,
+        data_type: str,
+        input_hash: str,
+        phases: dict[str, dict[str, float]],
+    ) -> None:
+        recorded_at, commit = time.time(), get_commit()
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.executemany(
+                    "INSERT INTO timings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            recorded_at,
+                            commit,
+                            platform.python_version(),
+                            data_type,
+                            day,
+                            phase,
+                            input_hash,
+                            stats["min"],
+                            stats["median"],
+                            stats["p95"],
+                            stats["stddev"],
+                        )
+                        for phase, stats in phases.items()
+                    ],
+                )
+
+    def get_trend(self, day: int, data_type: str, phase: str) -> list[HistoryPoint]:
+        """Timings of a day phase for each commit, in the order they were first
+        benchmarked. Each point is compared with the previous one measured with
+        the same Python version and input.
+        """
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            rows = connection.execute(
+                """
+                SELECT commit_hash, python_version, input_hash, MIN(median),
+                    COUNT(*), MIN(recorded_at) AS first_recorded_at
+                FROM timings WHERE day = ? AND data_type = ? AND phase = ?
+                GROUP BY commit_hash, python_version, input_hash
+                ORDER BY first_recorded_at
+                """,
+                (day, data_type, phase),
+            ).fetchall()
+
+        points = [HistoryPoint(*row[:5]) for row in rows]
+        previous_points: dict[tuple[str, str], HistoryPoint] = {}
+        for point in points:
+            key = (point.python_version, point.input_hash)
+            if previous_point := previous_points.get(key):
+                point.ratio = point.median / previous_point.median
+            previous_points[key] = point
+        return points
+
+    def get_days(self, data_type: str) -> list[int]:
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            rows = connection.execute(
+                "SELECT DISTINCT day FROM timings WHERE data_type = ? ORDER BY day",
+                (data_type,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+
+def get_commit() -> str:
+    """Short hash of the current commit, suffixed if there are uncommitted
+    changes as timings then don't reflect the commit code only.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short=12", "HEAD"],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        changes = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=ROOT_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{commit}-dirty" if changes else commit
+
+
+def get_input_hash(file_path: Path) -> str:
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
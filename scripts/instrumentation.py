@@ -0,0 +1,99 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Callable, TypeVar
+
+# Environment variable enabling the instrumentation. It must be set before the
+# modules of the days are imported, as functions are only wrapped if enabled.
+INSTRUMENTATION_ENV_VAR = "AOC_INSTRUMENTATION"
+
+Function = TypeVar("Function", bound=Callable)
+
+
+@dataclass
+class FunctionStats:
+    name: str
+    calls: int = 0
+
+    # Cumulative time spent in the function (in seconds), including the time
+    # spent in nested calls for recursive functions
+    total_time: float = 0.0
+
+    # Cache statistics, only available for cached functions
+    hits: int | None = None
+    misses: int | None = None
+    cache_size: int | None = None
+
+    @property
+    def hit_ratio(self) -> float | None:
+        if not self.hits and not self.misses:
+            return None
+        return self.hits / (self.hits + self.misses)
+
+
+# Instrumented functions, along with their statistics
+_registry: dict[str, tuple[FunctionStats, Callable]] = {}
+
+
+def enable() -> None:
+    os.environ[INSTRUMENTATION_ENV_VAR] = "1"
+
+
+def is_enabled() -> bool:
+    return os.getenv(INSTRUMENTATION_ENV_VAR) == "1"
+
+
+def hot(function: Function) -> Function:
+    """Mark a function as being on a hot path. If instrumentation is enabled,
+    its calls and cumulative time are recorded, along with its cache statistics
+    if it's cached (with functools.cache for example). Otherwise the function
+    is returned as is, so there is no overhead at all.
+    """
+    if not is_enabled():
+        return function
+
+    name = f"{function.__module__}.{function.__qualname__}"
+    stats = FunctionStats(name=name)
+    _registry[name] = (stats, function)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.total_time += time.perf_counter() - start
+            stats.calls += 1
+
+    return wrapper
+
+
+def get_stats() -> list[FunctionStats]:
+    """Statistics of every instrumented function, the slowest ones first"""
+    for stats, function in _registry.values():
+        if cache_info := getattr(function, "cache_info", None):
+            info = cache_info()
+            stats.hits, stats.misses, stats.cache_size = (
+                info.hits,
+                info.misses,
+                info.currsize,
+            )
+
+    return sorted(
+        (stats for stats, _ in _registry.values()),
+        key=lambda stats: stats.total_time,
+        reverse=True,
+    )
+
+
+def export_stats(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            [{**asdict(stats), "hit_ratio": stats.hit_ratio} for stats in get_stats()],
+            indent=2,
+        )
+    )
@@ -0,0 +1,110 @@
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generator
+
+from scripts.utils import Phase
+
+# Allocations made by the tracking itself or by the import system are ignored
+IGNORED_ALLOCATIONS_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+@dataclass
+class AllocationSite:
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class PhaseMemory:
+    phase: str
+
+    # Memory still allocated at the end of the phase (negative if freed)
+    net: int
+
+    # Highest memory allocated during the phase, above the one at its start
+    peak: int
+
+    # Lines having allocated the most memory still in use at the end of the
+    # phase. Temporary allocations freed within the phase don't show up here.
+    top_sites: list[AllocationSite]
+
+
+class MemoryTracker:
+    """Phase hook tracing the memory allocated by each phase of the puzzle
+    solving with tracemalloc, which slows down the execution noticeably.
+    """
+
+    def __init__(self, nb_sites: int = 5):
+        self.nb_sites = nb_sites
+        self.phases: list[PhaseMemory] = []
+        tracemalloc.start()
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+
+    @contextmanager
+    def __call__(self, phase: Phase | str) -> Generator[None, None, None]:
+        start_snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            end_snapshot = tracemalloc.take_snapshot()
+            self.phases.append(
+                PhaseMemory(
+                    phase=str(phase),
+                    net=current - start,
+                    peak=peak - start,
+                    top_sites=self._get_top_sites(start_snapshot, end_snapshot),
+                )
+            )
+
+    def _get_top_sites(
+        self, start_snapshot: tracemalloc.Snapshot, end_snapshot: tracemalloc.Snapshot
+    ) -> list[AllocationSite]:
+        statistics = end_snapshot.filter_traces(IGNORED_ALLOCATIONS_FILTERS).compare_to(
+            start_snapshot.filter_traces(IGNORED_ALLOCATIONS_FILTERS), "lineno"
+        )
+        return [
+            AllocationSite(
+                location=f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                size=stat.size_diff,
+                count=stat.count_diff,
+            )
+            for stat in statistics
+            if stat.size_diff > 0
+        ][: self.nb_sites]
+
+
+def get_peak_rss() -> int | None:
+    """Peak resident set size of the current process in bytes, only available
+    on Unix systems.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Unit is kilobytes on Linux, but bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def format_size(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f}{unit}" if unit != "B" else f"{size}B"
+        size /= 1024
+    return f"{size:.1f}GiB"
@@ -0,0 +1,134 @@
+import time
+from contextlib import contextmanager
+from enum import StrEnum
+from pathlib import Path
+from typing import Generator
+
+from scripts.utils import Phase
+
+PROFILES_PATH = Path(__file__).parent.parent / ".profiles"
+
+
+class ProfilerType(StrEnum):
+    PYINSTRUMENT = "pyinstrument"
+    CPROFILE = "cprofile"
+
+
+class ProfileFormat(StrEnum):
+    # Only printed in the terminal, no file is written
+    TEXT = "text"
+    HTML = "html"
+    SPEEDSCOPE = "speedscope"
+    PSTATS = "pstats"
+
+
+# File extension of each format, along with the profilers able to output it
+PROFILE_FORMATS = {
+    ProfileFormat.HTML: (".html", {ProfilerType.PYINSTRUMENT}),
+    ProfileFormat.SPEEDSCOPE: (
+        ".speedscope.json",
+        {ProfilerType.PYINSTRUMENT},
+    ),
+    ProfileFormat.PSTATS: (
+        ".pstats",
+        {ProfilerType.PYINSTRUMENT, ProfilerType.CPROFILE},
+    ),
+}
+
+
+class PhaseProfiler:
+    """Phase hook profiling each phase of the puzzle solving in its own session.
+    Profiles are printed in the terminal, or written in the profiles folder
+    of the day, their file name including the time of the run and the phase.
+    """
+
+    def __init__(
+        self,
+        day: int,
+        profiler_type: ProfilerType,
+        profile_format: ProfileFormat,
+        profiles_path: Path = PROFILES_PATH,
+    ):
+        if profile_format != ProfileFormat.TEXT and (
+            profiler_type not in PROFILE_FORMATS[profile_format][1]
+        ):
+            raise ValueError(f"{profiler_type} can't output {profile_format} profiles")
+
+        self.profiler_type = profiler_type
+        self.profile_format = profile_format
+        self.profiles_path = profiles_path / f"day{day:02d}"
+        self.run_name = time.strftime("%Y%m%d-%H%M%S")
+        self.profile_files: list[Path] = []
+
+    @contextmanager
+    def __call__(self, phase: Phase | str) -> Generator[None, None, None]:
+        if self.profiler_type == ProfilerType.PYINSTRUMENT:
+            profile_phase = self._profile_with_pyinstrument
+        else:
+            profile_phase = self._profile_with_cprofile
+
+        with profile_phase(str(phase)):
+            yield
+
+    @contextmanager
+    def _profile_with_pyinstrument(self, phase: str) -> Generator[None, None, None]:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import PstatsRenderer, SpeedscopeRenderer
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+
+        # Phases faster than the sampling interval have nothing to show
+        if not profiler.last_session.sample_count:
+            print(f"Phase {phase} is too fast to be profiled")
+            return
+
+        match self.profile_format:
+            case ProfileFormat.TEXT:
+                print(f"Profile of {phase} :")
+                profiler.print()
+            case ProfileFormat.HTML:
+                self._write_profile(phase, profiler.output_html())
+            case ProfileFormat.SPEEDSCOPE:
+                self._write_profile(phase, profiler.output(SpeedscopeRenderer()))
+            case ProfileFormat.PSTATS:
+                self._write_profile(phase, profiler.output(PstatsRenderer()))
+
+    @contextmanager
+    def _profile_with_cprofile(self, phase: str) -> Generator[None, None, None]:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+        if self.profile_format == ProfileFormat.TEXT:
+            print(f"Profile of {phase} :")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(20)
+        else:
+            profiler.dump_stats(self._get_profile_file(phase))
+
+    def _write_profile(self, phase: str, content: str) -> None:
+        """Binary outputs of pyinstrument (pstats) are given as surrogate-escaped
+        strings, written as is.
+        """
+        self._get_profile_file(phase).write_text(
+            content, encoding="utf-8", errors="surrogateescape", newline=""
+        )
+
+    def _get_profile_file(self, phase: str) -> Path:
+        self.profiles_path.mkdir(parents=True, exist_ok=True)
+        extension, _ = PROFILE_FORMATS[self.profile_format]
+        profile_file = (
+            self.profiles_path / f"{self.run_name}-{phase.replace(' ', '-')}{extension}"
+        )
+        self.profile_files.append(profile_file)
+        return profile_file
@@ -0,0 +1,164 @@
+import importlib
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator
+
+from scripts.backends import Backend
+from scripts.utils import DataType
+
+DAYS_PATH = Path(__file__).parent.parent / "days"
+
+
+@dataclass
+class DayRun:
+    day: int
+    results: tuple[int, int] | None
+    duration: float
+    error: str | None = None
+
+
+@dataclass
+class InputRun:
+    input_file: Path
+    results: tuple[int, int] | None
+    duration: float
+    error: str | None = None
+
+
+def get_existing_days() -> list[int]:
+    return sorted(int(day_path.name[3:]) for day_path in DAYS_PATH.glob("day*/"))
+
+
+def parse_days(days_ranges: list[str] | None) -> list[int]:
+    """Convert a list of days or ranges of days (ex: ["1-5", "8"]) into a
+    sorted list of existing days. Every existing day is returned if nothing
+    has been specified.
+    """
+    existing_days = get_existing_days()
+    if not days_ranges:
+        return existing_days
+
+    days: set[int] = set()
+    for days_range in days_ranges:
+        first, _, last = days_range.partition("-")
+        try:
+            first_day, last_day = int(first), int(last or first)
+        except ValueError:
+            raise ValueError(f"Invalid day or range of days : {days_range}")
+        days.update(range(first_day, last_day + 1))
+
+    return sorted(days.intersection(existing_days))
+
+
+def run_day(day: int, data_type: DataType) -> DayRun:
+    """Import, instanciate and run the puzzle solver of a given day. Errors are
+    returned instead of raised, so that a failing day doesn't stop the others.
+    Days already run on a process pool, so shards of lines are mapped in the
+    worker process itself.
+    """
+    start = time.perf_counter()
+    try:
+        day_module = importlib.import_module(f"days.day{day:02d}.main")
+        puzzle_solver = day_module.PuzzleSolver(
+            day=day, data_type=data_type, verbose=False, parallel_shards=False
+        )
+        results = puzzle_solver.solve()
+    except FileNotFoundError:
+        return DayRun(
+            day=day,
+            results=None,
+            duration=time.perf_counter() - start,
+            error=f"File {data_type.value}.txt not found",
+        )
+    except Exception as error:
+        return DayRun(
+            day=day,
+            results=None,
+            duration=time.perf_counter() - start,
+            error=repr(error),
+        )
+
+    return DayRun(day=day, results=results, duration=time.perf_counter() - start)
+
+
+def run_days(
+    days: list[int], data_type: DataType, workers: int | None = None
+) -> Generator[DayRun, None, None]:
+    """Run the puzzle solvers of several days on a process pool sized on the
+    number of cores by default. Runs are yielded as soon as they're finished.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    max_workers = min(workers or os.cpu_count() or 1, len(days))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_day, day, data_type) for day in days]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def get_input_files(inputs_path: Path) -> list[Path]:
+    """Every input file of a folder, hidden ones excepted"""
+    return sorted(
+        file_path
+        for file_path in inputs_path.iterdir()
+        if file_path.is_file() and not file_path.name.startswith(".")
+    )
+
+
+def run_input(day: int, input_file: Path, backend: Backend | None = None) -> InputRun:
+    """Run the puzzle solver of a given day on a given input file. The module of
+    the day is only imported by the first run of each worker process, and
+    shards of lines are mapped in the worker process itself.
+    """
+    start = time.perf_counter()
+    try:
+        day_module = importlib.import_module(f"days.day{day:02d}.main")
+        puzzle_solver = day_module.PuzzleSolver(
+            day=day,
+            data_type=DataType.INPUT,
+            verbose=False,
+            data_file=input_file,
+            parallel_shards=False,
+            backend=backend,
+        )
+        results = puzzle_solver.solve()
+    except Exception as error:
+        return InputRun(
+            input_file=input_file,
+            results=None,
+            duration=time.perf_counter() - start,
+            error=repr(error),
+        )
+
+    return InputRun(
+        input_file=input_file, results=results, duration=time.perf_counter() - start
+    )
+
+
+def run_inputs(
+    day: int,
+    input_files: list[Path],
+    workers: int | None = None,
+    backend: Backend | None = None,
+) -> Generator[InputRun, None, None]:
+    """Run the puzzle solver of a given day on several input files, on a process
+    pool sized on the number of cores by default. The module of the day is
+    imported once by each worker when it starts, and runs are yielded as soon
+    as they're finished.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    max_workers = min(workers or os.cpu_count() or 1, len(input_files))
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=importlib.import_module,
+        initargs=(f"days.day{day:02d}.main",),
+    ) as executor:
+        futures = [
+            executor.submit(run_input, day, input_file, backend)
+            for input_file in input_files
+        ]
+        for future in as_completed(futures):
+            yield future.result()
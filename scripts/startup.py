@@ -0,0 +1,90 @@
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT_PATH = Path(__file__).parent.parent
+
+# Lines written by python -X importtime : self time, cumulative time, and name
+# of the imported module, indented according to its nesting level
+IMPORT_TIME_PATTERN = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)$")
+
+
+@dataclass
+class StartupReport:
+    # Wall time of an interpreter doing nothing
+    interpreter: float
+
+    # Cumulative time of each top-level import done by the interpreter itself
+    interpreter_imports: dict[str, float]
+
+    # Cumulative time of each top-level import done by the application
+    application_imports: dict[str, float]
+
+    # Cumulative time of the imports done directly by each top-level import
+    nested_imports: dict[str, dict[str, float]]
+
+    @property
+    def application_imports_time(self) -> float:
+        return sum(self.application_imports.values())
+
+
+def measure_interpreter_startup(runs: int = 3) -> float:
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def measure_imports(
+    modules: list[str],
+) -> tuple[dict[str, float], dict[str, dict[str, float]]]:
+    """Import the given modules in a fresh interpreter with -X importtime, and
+    retrieve the cumulative import time (in seconds) of every top-level import,
+    along with the ones of the imports they directly made.
+    """
+    code = f"import {', '.join(modules)}" if modules else "pass"
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT_PATH,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Nested imports are written before the module importing them
+    imports, nested_imports, pending_imports = {}, {}, {}
+    for line in process.stderr.splitlines():
+        if not (match := IMPORT_TIME_PATTERN.match(line)):
+            continue
+
+        cumulative, indent, module = match.groups()
+        if not indent:
+            imports[module] = int(cumulative) / 1_000_000
+            nested_imports[module], pending_imports = pending_imports, {}
+        elif len(indent) == 2:
+            pending_imports[module] = int(cumulative) / 1_000_000
+
+    return imports, nested_imports
+
+
+def measure_startup(modules: list[str]) -> StartupReport:
+    """Break down the startup time of an interpreter importing the given
+    modules, between the interpreter itself and the application imports.
+    """
+    interpreter_imports, _ = measure_imports([])
+    imports, nested_imports = measure_imports(modules)
+    return StartupReport(
+        interpreter=measure_interpreter_startup(),
+        interpreter_imports=interpreter_imports,
+        application_imports={
+            module: duration
+            for module, duration in imports.items()
+            if module not in interpreter_imports
+        },
+        nested_imports=nested_imports,
+    )
@@ -0,0 +1,185 @@
+import asyncio
+import re
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from enum import Enum, auto
+
+import httpx
+from rich import print
+
+from scripts.cache import CACHE_PATH
+from scripts.client import create_client
+
+
+class AnswerResult(Enum):
+    # AoC gives the same reply when the task has already been solved, and when
+    # the previous task hasn't been solved yet, it's never logged then
+    WRONG_LEVEL = auto()
+    RIGHT_ANSWER = auto()
+    WRONG_ANSWER = auto()
+    TOO_RECENT = auto()
+
+
+@dataclass
+class Submission:
+    day: int
+    task: int
+    answer: int
+
+
+@dataclass
+class SubmissionResult:
+    submission: Submission
+    result: AnswerResult | None
+
+    # Whether the result comes from the submission log, without any request
+    known: bool = False
+
+
+class SubmissionLog:
+    """Persistent log of the answers submitted to AoC, along with their verdict"""
+
+    database_path = CACHE_PATH / "submissions.sqlite3"
+
+    def __init__(self):
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS submissions (
+                        day INTEGER NOT NULL,
+                        task INTEGER NOT NULL,
+                        answer TEXT NOT NULL,
+                        result TEXT NOT NULL,
+                        submitted_at REAL NOT NULL
+                    )
+                    """
+                )
+
+    def get_known_result(self, submission: Submission) -> AnswerResult | None:
+        """Result of a submission, if it can be deduced from previous ones. Once
+        the right answer of a task is known, any other answer is wrong. Only
+        right and wrong answers are logged, as other replies don't say anything
+        about the answer itself.
+        """
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            rows = connection.execute(
+                "SELECT answer, result FROM submissions WHERE day = ? AND task = ? "
+                "AND result IN ('RIGHT_ANSWER', 'WRONG_ANSWER')",
+                (submission.day, submission.task),
+            ).fetchall()
+
+        answer = str(submission.answer)
+        results = {(row_answer, AnswerResult[result]) for row_answer, result in rows}
+        if (answer, AnswerResult.RIGHT_ANSWER) in results:
+            return AnswerResult.RIGHT_ANSWER
+        if (answer, AnswerResult.WRONG_ANSWER) in results or any(
+            result == AnswerResult.RIGHT_ANSWER for _, result in results
+        ):
+            return AnswerResult.WRONG_ANSWER
+        return None
+
+    def record(self, submission: Submission, result: AnswerResult) -> None:
+        with closing(sqlite3.connect(self.database_path)) as connection:
+            with connection:
+                connection.execute(
+                    "INSERT INTO submissions VALUES (?, ?, ?, ?, ?)",
+                    (
+                        submission.day,
+                        submission.task,
+                        str(submission.answer),
+                        result.name,
+                        time.time(),
+                    ),
+                )
+
+
+def parse_answer_result(response_text: str) -> tuple[AnswerResult, int]:
+    """Retrieve the result of a submission from AoC response, along with the
+    number of seconds to wait before submitting again if it was too recent.
+    """
+    if "That's the right answer" in response_text:
+        return AnswerResult.RIGHT_ANSWER, 0
+    elif "You don't seem to be solving the right level" in response_text:
+        return AnswerResult.WRONG_LEVEL, 0
+    elif "You gave an answer too recently" in response_text:
+        wait = re.search(r"You have (?:(\d+)m )?(\d+)s left to wait", response_text)
+        minutes, seconds = wait.groups() if wait else (None, "60")
+        return AnswerResult.TOO_RECENT, int(minutes or 0) * 60 + int(seconds)
+    else:
+        return AnswerResult.WRONG_ANSWER, 0
+
+
+async def _submit(
+    client: httpx.AsyncClient, submission: Submission
+) -> tuple[AnswerResult | None, int]:
+    """Answers are never retried on errors, as AoC may have received them
+    anyway, and submitting them twice would count as two attempts.
+    """
+    print(f"Submitting answer for day {submission.day} task {submission.task}...")
+    try:
+        response = await client.post(
+            f"/day/{submission.day}/answer",
+            data={"level": submission.task, "answer": str(submission.answer)},
+        )
+    except httpx.HTTPError as error:
+        print(f"[red]Error from AoC when submitting solution : {error!r}[/red]")
+        return None, 0
+
+    if response.status_code != httpx.codes.OK:
+        print(f"[red]Error from AoC when submitting solution : {response}[/red]")
+        return None, 0
+
+    return parse_answer_result(response.text)
+
+
+async def submit_answers(
+    submissions: list[Submission],
+    session_id: str,
+    interval: float = 5.0,
+    max_wait: float = 120.0,
+) -> list[SubmissionResult]:
+    """Submit several answers to AoC, one at a time on a single connection and
+    waiting between consecutive submissions. Answers whose result can be
+    deduced from the submission log are not submitted again. If AoC asks to
+    wait before submitting again, the queue waits (up to a maximum) and retries.
+    """
+    submission_log = SubmissionLog()
+    queue: asyncio.Queue[Submission] = asyncio.Queue()
+    submission_results: list[SubmissionResult] = []
+
+    for submission in submissions:
+        if known_result := submission_log.get_known_result(submission):
+            submission_results.append(
+                SubmissionResult(submission=submission, result=known_result, known=True)
+            )
+        else:
+            queue.put_nowait(submission)
+
+    if queue.empty():
+        return submission_results
+
+    async with create_client(session_id, max_connections=1) as client:
+        is_first_submission = True
+        while not queue.empty():
+            submission = queue.get_nowait()
+            if not is_first_submission:
+                await asyncio.sleep(interval)
+            is_first_submission = False
+
+            result, wait = await _submit(client, submission)
+            if result == AnswerResult.TOO_RECENT and wait <= max_wait:
+                print(f"Answer submitted too recently, waiting {wait}s...")
+                await asyncio.sleep(wait)
+                result, _ = await _submit(client, submission)
+
+            if result in (AnswerResult.RIGHT_ANSWER, AnswerResult.WRONG_ANSWER):
+                submission_log.record(submission, result)
+            submission_results.append(
+                SubmissionResult(submission=submission, result=result)
+            )
+
+    return submission_results
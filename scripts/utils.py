@@ -1,49 +1,296 @@
+import hashlib
+import mmap
 import os
+import random
+import sys
+import weakref
 from abc import ABC, abstractmethod
-from enum import Enum, auto
-from functools import cached_property
+from collections import deque
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+from enum import Enum, StrEnum
+from functools import cached_property, update_wrapper
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Generator, NamedTuple
 
-import httpx
-from rich import print
+from scripts.backends import Backend, select_backend
+
+SCRIPTS_PATH = Path(__file__).parent
+
+# Data file standing for the standard input, only readable by streaming solvers
+STDIN_PATH = Path("-")
 
 
 class DataType(str, Enum):
     EXAMPLE = "example"
     INPUT = "input"
+    GENERATED = "generated"
+
+
+class Phase(StrEnum):
+    LOAD = "load"
+    PARSE = "parse"
+    FIRST_PART = "part 1"
+    SECOND_PART = "part 2"
+
+
+# Called with each phase of the puzzle solving, the returned context manager
+# wraps the execution of the phase (used for timing or profiling it)
+PhaseHook = Callable[[Phase], AbstractContextManager]
+
+
+def chain_phase_hooks(*phase_hooks: PhaseHook | None) -> PhaseHook | None:
+    """Single phase hook entering every given one (None being ignored), in order"""
+    phase_hooks = [phase_hook for phase_hook in phase_hooks if phase_hook]
+    if len(phase_hooks) <= 1:
+        return phase_hooks[0] if phase_hooks else None
+
+    @contextmanager
+    def chained_phase_hook(phase: Phase) -> Generator[None, None, None]:
+        with ExitStack() as stack:
+            for phase_hook in phase_hooks:
+                stack.enter_context(phase_hook(phase))
+            yield
+
+    return chained_phase_hook
 
 
 class AbstractPuzzleSolver(ABC):
     day: int
     data_type: DataType
-    lines: list[str]
+    data_file: Path
 
-    def __init__(self, day: int, data_type: DataType):
-        self.day = day
-        self.data_type = data_type
-        self.__get_puzzle_data()
+    # Raw content of the input file, memory-mapped (empty bytes for empty files)
+    data: mmap.mmap | bytes
 
-    @cached_property
-    def line(self) -> str:
-        return self.lines[0]
+    # Result of the parsing stage, shared by both parts
+    parsed_input: Any
+
+    # Whether parts rely on state mutated while solving them, in which case
+    # they can't be solved concurrently in separate workers
+    shared_mutable_state: bool = False
 
-    def __get_puzzle_data(self) -> list[str]:
-        data_file = (
+    # Whether the solver folds the input lines one at a time, without ever
+    # keeping all of them in memory (see StreamingPuzzleSolver)
+    streaming: bool = False
+
+    # Whether map-reduce solvers map shards of lines on a process pool, None
+    # meaning only for big inputs (see MapReducePuzzleSolver)
+    parallel_shards: bool | None
+
+    # Backends the solver can use, from the default one to the fastest one, and
+    # input size (in bytes) from which the fastest available one is used
+    backends: tuple[Backend, ...] = (Backend.PYTHON,)
+    big_input_threshold: int = 1 << 20
+
+    # Class method generating the lines of a valid synthetic input from a scale
+    # and a random generator, a scale of 1 being roughly the size of a real
+    # input (None for days without input generator)
+    generate_input: (
+        Callable[[int, random.Random], Generator[str, None, None]] | None
+    ) = None
+
+    # Backend used by the solver, chosen on input size unless requested
+    backend: Backend
+
+    def __init__(
+        self,
+        day: int,
+        data_type: DataType,
+        verbose: bool = True,
+        phase_hook: PhaseHook | None = None,
+        parse_cache: bool = False,
+        data_file: Path | None = None,
+        parallel_shards: bool | None = None,
+        backend: Backend | None = None,
+    ):
+        self.day = day
+        self.data_type = data_type
+        self.verbose = verbose
+        self.phase_hook = phase_hook
+        self.parse_cache = parse_cache
+        self.parallel_shards = parallel_shards
+        self.data_file = data_file or (
             Path(__file__).parent.parent
             / "days"
             / f"day{self.day:02d}"
             / f"{self.data_type.value}.txt"
         )
-        print(f"Loading {data_file}...")
-        if not data_file.exists():
-            raise FileNotFoundError
 
-        with data_file.open() as file:
-            self.lines = [line.rstrip("\n") for line in file]
+        with self._phase(Phase.LOAD):
+            self.__get_puzzle_data()
+
+        self.backend = select_backend(
+            self.backends,
+            input_size=len(self.data),
+            big_input_threshold=self.big_input_threshold,
+            requested=backend,
+        )
+
+        # Other backends need the whole input at once
+        if self.data_file == STDIN_PATH and self.backend != self.backends[0]:
+            raise ValueError(
+                f"Only the {self.backends[0]} backend can read the standard input"
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Memory-mapped data can't be pickled to be sent to worker processes,
+        it will be mapped again from the file when unpickling, and lines decoded
+        from it again when needed. Memoized methods caches aren't sent either,
+        workers start with empty ones.
+        """
+        state = {
+            attribute: value
+            for attribute, value in self.__dict__.items()
+            if not isinstance(value, MemoizedCache)
+        }
+        for attribute in ("data", "buffer", "lines", "line", "phase_hook"):
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self.phase_hook = None
+        self.__map_data_file()
+
+    @cached_property
+    def line(self) -> str:
+        return self.lines[0]
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """Input lines, only built when a solver needs them"""
+        return list(self.iter_lines())
+
+    @cached_property
+    def buffer(self) -> memoryview:
+        """Zero-copy view over the raw content of the input file"""
+        return memoryview(self.data)
+
+    @cached_property
+    def input_hash(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    @cached_property
+    def source_hash(self) -> str:
+        """Hash of the solver code, including the shared scripts it relies on"""
+        digest = hashlib.sha256()
+        for source_file in (
+            Path(sys.modules[type(self).__module__].__file__),
+            *sorted(SCRIPTS_PATH.glob("*.py")),
+        ):
+            digest.update(source_file.read_bytes())
+        return digest.hexdigest()
+
+    def iter_lines(self) -> Generator[str, None, None]:
+        """Lazily decode the input lines from the raw content of the file, or
+        read them from the standard input (which can only be done once).
+        """
+        if self.data_file == STDIN_PATH:
+            for line in sys.stdin:
+                yield line.removesuffix("\n").removesuffix("\r")
+            return
+
+        start, data_length = 0, len(self.data)
+        while start < data_length:
+            if (end := self.data.find(b"\n", start)) == -1:
+                end = data_length
+            yield self.data[start:end].decode().removesuffix("\r")
+            start = end + 1
+
+    def __get_puzzle_data(self) -> None:
+        if self.data_file == STDIN_PATH:
+            if not self.streaming:
+                raise ValueError(
+                    f"Day {self.day} doesn't stream its input, it can't read the "
+                    "standard input"
+                )
+            if self.verbose:
+                print("Reading standard input...")
+        else:
+            if self.verbose:
+                print(f"Loading {self.data_file}...")
+            if not self.data_file.exists():
+                raise FileNotFoundError
+
+        self.__map_data_file()
+
+    def __map_data_file(self) -> None:
+        # Standard input is read line by line while solving
+        if self.data_file == STDIN_PATH:
+            self.data = b""
+            return
+
+        # Empty files can't be memory-mapped
+        with self.data_file.open("rb") as file:
+            self.data = (
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if self.data_file.stat().st_size > 0
+                else b""
+            )
+
+    def solve(self, parallel_parts: bool = False) -> tuple[int, int]:
+        """Solve both parts of the puzzle, sequentially by default. If parallel
+        parts are asked, each part is solved in its own worker process, unless
+        the solver relies on shared mutable state.
+        """
+        with self._phase(Phase.PARSE):
+            self.parsed_input = self._get_parsed_input()
+
+        if parallel_parts and not self.shared_mutable_state:
+            return self._solve_parts_in_parallel()
 
-    def solve(self) -> tuple[int, int]:
-        return self._solve_first_part(), self._solve_second_part()
+        with self._phase(Phase.FIRST_PART):
+            first_part_result = self._solve_first_part()
+
+        with self._phase(Phase.SECOND_PART):
+            second_part_result = self._solve_second_part()
+
+        return first_part_result, second_part_result
+
+    def _solve_parts_in_parallel(self) -> tuple[int, int]:
+        """The solver is sent once to each worker, along with its parsed input"""
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            first_part_future = executor.submit(solve_part, self, Phase.FIRST_PART)
+            second_part_future = executor.submit(solve_part, self, Phase.SECOND_PART)
+            return first_part_future.result(), second_part_future.result()
+
+    def clear_caches(self) -> None:
+        """Clear the caches of every memoized method of the solver"""
+        for value in self.__dict__.values():
+            if isinstance(value, MemoizedCache):
+                value.cache_clear()
+
+    def _phase(self, phase: Phase) -> AbstractContextManager:
+        return self.phase_hook(phase) if self.phase_hook else nullcontext()
+
+    def parse(self) -> Any:
+        """Parse the input once for both parts, nothing is parsed by default"""
+        return None
+
+    def _get_parsed_input(self) -> Any:
+        """Parse the input, or retrieve it from the on-disk cache if enabled. The
+        cache is keyed by the hash of both the input file and the solver code,
+        each backend having its own.
+        """
+        # Standard input can't be hashed before being read
+        if not self.parse_cache or self.data_file == STDIN_PATH:
+            return self.parse()
+
+        from scripts.cache import MISSING, load_parsed_input, save_parsed_input
+
+        cache_prefix = f"day{self.day:02d}-{self.data_type.value}-{self.backend}"
+        cache_key = f"{self.input_hash[:16]}-{self.source_hash[:16]}"
+        if (parsed_input := load_parsed_input(cache_prefix, cache_key)) is not MISSING:
+            if self.verbose:
+                print("Parsed input loaded from cache")
+            return parsed_input
+
+        parsed_input = self.parse()
+        save_parsed_input(cache_prefix, cache_key, parsed_input)
+        return parsed_input
 
     @abstractmethod
     def _solve_first_part(self) -> int: ...
@@ -52,6 +299,225 @@ class AbstractPuzzleSolver(ABC):
     def _solve_second_part(self) -> int: ...
 
 
+class StreamingPuzzleSolver(AbstractPuzzleSolver):
+    """Solver of days handling each line of the input independently. Lines are
+    folded one at a time into running aggregates, in a single pass which is the
+    parsing stage, and both parts are then solved from the final aggregates.
+    Input is never kept in memory as a whole, so it can be of any size, and be
+    read from the standard input.
+    """
+
+    streaming = True
+
+    # Final aggregates of the whole input
+    parsed_input: Any
+
+    def parse(self) -> Any:
+        state = self._initial_state()
+        for line in self.iter_lines():
+            state = self._fold_line(state, line)
+        return state
+
+    @abstractmethod
+    def _initial_state(self) -> Any:
+        """Aggregates before any line has been read"""
+
+    @abstractmethod
+    def _fold_line(self, state: Any, line: str) -> Any:
+        """Aggregates updated with a line of the input"""
+
+
+class MapReducePuzzleSolver(StreamingPuzzleSolver):
+    """Streaming solver whose lines are mapped to partial results independently
+    of each other, partial results being then combined with an associative
+    reduce function. Big inputs are split into shards of lines, mapped and
+    reduced on a process pool, only the reduced result of each shard being
+    sent back.
+    """
+
+    # Number of lines sent to a worker at once
+    shard_size: int = 2000
+
+    # Inputs (in bytes) from which shards are mapped in parallel, as smaller
+    # ones aren't worth the process pool overhead
+    parallel_threshold: int = 1 << 20
+
+    def parse(self) -> Any:
+        """Shards are mapped in parallel for big inputs, unless the solver has
+        been asked to stay in the current process. They can also be mapped in
+        parallel whatever the size of the input (for the standard input, whose
+        size isn't known).
+        """
+        workers = os.cpu_count() or 1
+        if self.parallel_shards is None:
+            parallel_shards = len(self.data) >= self.parallel_threshold
+        else:
+            parallel_shards = self.parallel_shards
+
+        if workers == 1 or not parallel_shards:
+            return super().parse()
+
+        return self._map_reduce_in_shards(workers)
+
+    def _map_reduce_in_shards(self, workers: int) -> Any:
+        """The solver is sent once to each worker. Shards are read lazily, with a
+        bounded number of them waiting for a worker, so that memory stays bounded.
+        """
+        from concurrent.futures import Future, ProcessPoolExecutor
+
+        state = self._initial_state()
+        lines, pending_shards = self.iter_lines(), deque[Future]()
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=init_map_worker, initargs=(self,)
+        ) as executor:
+            while shard := list(islice(lines, self.shard_size)):
+                pending_shards.append(executor.submit(map_shard, shard))
+                if len(pending_shards) >= 2 * workers:
+                    state = self._reduce(state, pending_shards.popleft().result())
+
+            while pending_shards:
+                state = self._reduce(state, pending_shards.popleft().result())
+
+        return state
+
+    def _fold_line(self, state: Any, line: str) -> Any:
+        return self._reduce(state, self._map_line(line))
+
+    def _map_lines(self, lines: list[str]) -> Any:
+        state = self._initial_state()
+        for line in lines:
+            state = self._reduce(state, self._map_line(line))
+        return state
+
+    @abstractmethod
+    def _map_line(self, line: str) -> Any:
+        """Partial result of a single line of the input"""
+
+    @abstractmethod
+    def _reduce(self, first: Any, second: Any) -> Any:
+        """Combination of two partial results, in an associative way"""
+
+
+# Solver of a map worker process, sent once when the worker starts
+_map_worker_solver: MapReducePuzzleSolver | None = None
+
+
+def init_map_worker(puzzle_solver: MapReducePuzzleSolver) -> None:
+    global _map_worker_solver
+    _map_worker_solver = puzzle_solver
+
+
+def map_shard(lines: list[str]) -> Any:
+    """Map and reduce a shard of lines, used by worker processes"""
+    return _map_worker_solver._map_lines(lines)
+
+
+def solve_part(puzzle_solver: AbstractPuzzleSolver, phase: Phase) -> int:
+    """Solve a single part of the puzzle, used by worker processes"""
+    if phase == Phase.FIRST_PART:
+        return puzzle_solver._solve_first_part()
+    return puzzle_solver._solve_second_part()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int | None
+    currsize: int
+
+
+class MemoizedCache:
+    """Cache of a memoized method for a given instance, evicting the least
+    recently used entries once its maximum size is reached (if any).
+    """
+
+    def __init__(self, method: Callable, maxsize: int | None):
+        self.method = method
+        self.maxsize = maxsize
+        self.entries: dict[Any, Any] = {}
+        self.hits = self.misses = 0
+
+    def __call__(self, *args, **kwargs) -> Any:
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        try:
+            value = self.entries[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            # Move the entry to the end, so that it's evicted last
+            if self.maxsize is not None:
+                self.entries[key] = self.entries.pop(key)
+            return value
+
+        self.misses += 1
+        value = self.method(*args, **kwargs)
+        if self.maxsize is not None and len(self.entries) >= self.maxsize:
+            if self.maxsize == 0:
+                return value
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = value
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def cache_clear(self) -> None:
+        self.entries.clear()
+        self.hits = self.misses = 0
+
+
+class MemoizedMethod:
+    """Method whose results are cached on each instance, unlike functools.cache
+    which keys a single global cache on self and keeps instances alive forever.
+    Caches are stored on the instances, and freed along with them.
+    """
+
+    def __init__(self, function: Callable, maxsize: int | None):
+        update_wrapper(self, function)
+        self.function = function
+        self.maxsize = maxsize
+        self.cache_attribute = f"_memoized_{function.__name__}"
+        self.caches: weakref.WeakSet[MemoizedCache] = weakref.WeakSet()
+
+    def __get__(self, instance: Any, owner: type | None = None) -> Any:
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.cache_attribute]
+        except KeyError:
+            cache = MemoizedCache(self.function.__get__(instance), self.maxsize)
+            instance.__dict__[self.cache_attribute] = cache
+            self.caches.add(cache)
+            return cache
+
+    def __call__(self, instance: Any, *args, **kwargs) -> Any:
+        """Called when the method is wrapped by another decorator"""
+        return self.__get__(instance)(*args, **kwargs)
+
+    def cache_info(self) -> CacheInfo:
+        """Statistics of the caches of every living instance"""
+        caches_info = [cache.cache_info() for cache in self.caches]
+        return CacheInfo(
+            hits=sum(cache_info.hits for cache_info in caches_info),
+            misses=sum(cache_info.misses for cache_info in caches_info),
+            maxsize=self.maxsize,
+            currsize=sum(cache_info.currsize for cache_info in caches_info),
+        )
+
+
+def memoize(maxsize: int | None = None) -> Callable[[Callable], MemoizedMethod]:
+    """Memoize a method on each instance, keeping at most maxsize results if
+    given. Statistics are available with cache_info(), and caches of a solver
+    can be cleared with its clear_caches() method.
+    """
+
+    def decorator(function: Callable) -> MemoizedMethod:
+        return MemoizedMethod(function, maxsize=maxsize)
+
+    return decorator
+
+
 class Multiton(ABC):
     _instances = {}
 
@@ -66,6 +532,8 @@ def min_and_max(first: Any, second: Any) -> tuple[Any, Any]:
 
 
 def create_empty_file(file_path: Path) -> None:
+    from rich import print
+
     if not file_path.exists():
         file_path.touch()
         print(f"[green]File [bold]{file_path.name}[/bold] created.[/green]")
@@ -74,6 +542,9 @@ def create_empty_file(file_path: Path) -> None:
 
 
 def get_input(day: int) -> str | None:
+    import httpx
+    from rich import print
+
     if not (session_id := os.getenv("AOC_SESSION_ID")):
         print("[rouge]No session ID found, input can't be retrieved from AoC[/rouge]")
         return
@@ -87,35 +558,3 @@ def get_input(day: int) -> str | None:
 
     print("[green]Input data retrieved from AoC ![/green]")
     return response.text
-
-
-class AnswerResult(Enum):
-    ALREADY_SOLVED = auto()
-    RIGHT_ANSWER = auto()
-    WRONG_ANSWER = auto()
-
-
-def submit_answer(day: int, task: int, answer: int) -> AnswerResult | None:
-    if not (session_id := os.getenv("AOC_SESSION_ID")):
-        print("[rouge]No session ID found, input can't be retrieved from AoC[/rouge]")
-        return
-
-    print(f"Submitting answer for task {task} to AoC...")
-    submit_url = f"{os.getenv('AOC_BASE_URL')}/day/{day}/answer"
-    response = httpx.post(
-        submit_url,
-        cookies={"session": session_id},
-        data={"level": task, "answer": str(answer)},
-    )
-    if response.status_code != httpx.codes.OK:
-        print(f"[red]Error from AoC when submitting solution : {response}[/red]")
-        return
-
-    print("[green]Answer submitted to AoC ![/green]")
-
-    if "That's the right answer" in response.text:
-        return AnswerResult.RIGHT_ANSWER
-    elif "You don't seem to be solving the right level" in response.text:
-        return AnswerResult.ALREADY_SOLVED
-    else:
-        return AnswerResult.WRONG_ANSWER